@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FactionConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "faction"
+
+    def ready(self):
+        from . import search_index  # noqa: F401  (connects the search index receivers)
@@ -0,0 +1,177 @@
+# faction/cache.py
+""" Faction Cache Versioning Helpers. """
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+TREE_VERSION = "tree"
+SUBTREE_VERSION = "subtree"
+ENROLLMENT_VERSION = "enrollment"
+
+# User fields shown in cached member tables; edits to them invalidate the member's factions.
+MEMBER_USER_FIELDS = frozenset({"username", "first_name", "last_name", "email", "user_type"})
+
+# Models whose receivers in this app already bump a per-faction namespace. Any
+# other model a widget declares gets a namespace of its own (see CachedWidgetData).
+MODEL_VERSIONS = {
+    "faction.faction": SUBTREE_VERSION,
+    "faction.attendeeprofile": SUBTREE_VERSION,
+    "faction.leaderprofile": SUBTREE_VERSION,
+    "enrollment.factionenrollment": ENROLLMENT_VERSION,
+    "enrollment.attendeeenrollment": ENROLLMENT_VERSION,
+    "enrollment.leaderenrollment": ENROLLMENT_VERSION,
+}
+
+_MISSING = object()
+
+
+def version_key(namespace, key):
+    return f"faction:version:{namespace}:{key}"
+
+
+def new_version():
+    """
+    Return a version token that has never been issued before.
+
+    Tokens are random rather than counters, so a version key that is evicted
+    and recreated can never repeat a token an older snapshot or cache entry
+    was built under.
+    """
+    return uuid.uuid4().hex
+
+
+def get_versions(*pairs):
+    """
+    Return the version tokens of each ``(namespace, key)`` pair with one cache read.
+    """
+    keys = [version_key(namespace, key) for namespace, key in pairs]
+    found = cache.get_many(keys)
+    for cache_key in keys:
+        if cache_key not in found:
+            version = new_version()
+            # A token another process set in the meantime wins over ours.
+            if not cache.add(cache_key, version, timeout=None):
+                version = cache.get(cache_key, version)
+            found[cache_key] = version
+    return tuple(found[cache_key] for cache_key in keys)
+
+
+def get_version(namespace, key):
+    """
+    Return the current version token for ``namespace``/``key``.
+
+    Versions live in the shared cache so a bump in one process invalidates
+    derived data in every other process.
+    """
+    return cache.get_or_set(version_key(namespace, key), new_version, timeout=None)
+
+
+def bump_version(namespace, key):
+    """
+    Replace the version token for ``namespace``/``key`` and return the new one.
+    """
+    version = new_version()
+    cache.set(version_key(namespace, key), version, timeout=None)
+    return version
+
+
+def bump_subtree_versions(*faction_ids):
+    """
+    Bump the subtree version of each faction and of all of its ancestors.
+
+    Ancestors are resolved with one closure query now; the bumps run once
+    the surrounding transaction commits.
+    """
+    from .models.closure import FactionClosure
+
+    faction_ids = [pk for pk in faction_ids if pk]
+    if not faction_ids:
+        return
+    ids = set(
+        FactionClosure.objects.filter(descendant_id__in=faction_ids).values_list(
+            "ancestor_id", flat=True
+        )
+    )
+    ids.update(faction_ids)
+    transaction.on_commit(lambda: [bump_version(SUBTREE_VERSION, pk) for pk in ids])
+
+
+def model_version_namespace(label):
+    """Return the per-faction version namespace bumped by changes to model ``label``."""
+    label = label.lower()
+    return MODEL_VERSIONS.get(label, f"model:{label}")
+
+
+def bump_declared_model_version(sender, instance, **kwargs):
+    """
+    Bump ``sender``'s version for the instance's faction and every faction below it.
+
+    Rows attached to a faction (announcements, resources) also show on the
+    dashboards of its sub-factions. Rows without a ``faction_id`` are left to
+    the widget's TTL.
+    """
+    from .models.closure import FactionClosure
+
+    faction_id = getattr(instance, "faction_id", None)
+    if not faction_id:
+        return
+    namespace = model_version_namespace(sender._meta.label_lower)
+    ids = set(
+        FactionClosure.objects.filter(ancestor_id=faction_id).values_list(
+            "descendant_id", flat=True
+        )
+    )
+    ids.add(faction_id)
+    transaction.on_commit(lambda: [bump_version(namespace, pk) for pk in ids])
+
+
+class CachedWidgetData:
+    """
+    Cache a dashboard data function per faction and portal.
+
+    Results live for ``ttl`` seconds, or until a row of one of the
+    ``invalidated_by`` models (``"app_label.ModelName"``) changes for the
+    faction. Each model maps to a per-faction version namespace whose token
+    is part of the key, so a change in one faction leaves every other
+    faction's entries valid. Models of other apps can be added per widget
+    with the ``FACTION_WIDGET_INVALIDATED_BY`` setting (``{name: [labels]}``).
+    """
+
+    def __init__(self, name, func, ttl, invalidated_by=()):
+        self.name = name
+        self.func = func
+        self.ttl = ttl
+        labels = (
+            *invalidated_by,
+            *getattr(settings, "FACTION_WIDGET_INVALIDATED_BY", {}).get(name, ()),
+        )
+        self.versions = tuple(dict.fromkeys(model_version_namespace(label) for label in labels))
+        for label in labels:
+            if label.lower() in MODEL_VERSIONS:
+                continue
+            # String senders connect lazily once the model is registered.
+            for signal in (post_save, post_delete):
+                signal.connect(
+                    bump_declared_model_version,
+                    sender=label,
+                    weak=False,
+                    dispatch_uid=f"faction-model-version-{label.lower()}",
+                )
+
+    def cache_key(self, faction, portal):
+        versions = get_versions(*((namespace, faction.pk) for namespace in self.versions))
+        return f"faction:widget:{self.name}:{portal}:{faction.pk}:{'.'.join(versions)}"
+
+    def __call__(self, faction, portal):
+        if faction is None:
+            return self.func(faction)
+        key = self.cache_key(faction, portal)
+        result = cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = self.func(faction)
+            cache.set(key, result, self.ttl)
+        return result
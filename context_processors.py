@@ -1,33 +1,65 @@
 # faction/context_processors.py
 
-from .models.faction import Faction
-from .models.attendee import Attendee
-from .models.leader import Leader
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject, cached_property
+
+from .cache import SUBTREE_VERSION, get_version
+from .tree import get_faction_tree
+
+FACTION_COUNTS_TIMEOUT = 60 * 60
+
+
+class UserFactionCounts:
+    """
+    Resolve the user's faction and its counts on first access only.
+
+    Counts come from the faction's persisted counter columns and are cached
+    per faction under its subtree version, which profile and faction signals
+    bump whenever the subtree changes, so a cache hit skips loading the faction.
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def profile(self):
+        for attr in ("attendeeprofile_profile", "leaderprofile_profile"):
+            profile = getattr(self.user, attr, None)
+            if profile is not None and profile.faction_id:
+                return profile
+        return None
+
+    @cached_property
+    def faction(self):
+        return self.profile.faction if self.profile else None
+
+    @cached_property
+    def counts(self):
+        if self.profile is None:
+            return {"attendee": 0, "leader": 0, "sub_factions": 0}
+
+        faction_id = self.profile.faction_id
+        key = f"faction:counts:{faction_id}:{get_version(SUBTREE_VERSION, faction_id)}"
+        counts = cache.get(key)
+        if counts is None:
+            faction = self.faction
+            tree = get_faction_tree(faction.organization_id)
+            counts = faction.member_counts()
+            counts["sub_factions"] = len(tree.children_of(faction.pk))
+            cache.set(key, counts, FACTION_COUNTS_TIMEOUT)
+        return counts
 
 
 def faction_counts(request):
     if not request.user.is_authenticated:
         return {}
 
-    faction = None
-    if hasattr(request.user, "attendeeprofile"):
-        faction = request.user.attendeeprofile.faction
-    elif hasattr(request.user, "leaderprofile"):
-        faction = request.user.leaderprofile.faction
-
-    if faction:
-        faction_data = {
-            "user_faction": faction,
-            "user_faction_attendee_count": faction.member_count(user_type="attendee"),
-            "user_faction_leader_count": faction.member_count(user_type="leader"),
-            "user_faction_sub_faction_count": faction.with_sub_faction_count(),
-        }
-    else:
-        faction_data = {
-            "user_faction": None,
-            "user_faction_attendee_count": 0,
-            "user_faction_leader_count": 0,
-            "user_faction_sub_faction_count": 0,
-        }
-
-    return faction_data
+    stats = UserFactionCounts(request.user)
+    return {
+        "user_faction": SimpleLazyObject(lambda: stats.faction),
+        "user_faction_attendee_count": SimpleLazyObject(lambda: stats.counts["attendee"]),
+        "user_faction_leader_count": SimpleLazyObject(lambda: stats.counts["leader"]),
+        "user_faction_sub_faction_count": SimpleLazyObject(
+            lambda: stats.counts["sub_factions"]
+        ),
+    }
@@ -0,0 +1,45 @@
+# faction/dashboard_data.py
+""" Cached Faction Dashboard Data. """
+
+from core import dashboard_data
+
+from .cache import CachedWidgetData
+
+ENROLLMENT_MODELS = (
+    "enrollment.FactionEnrollment",
+    "enrollment.AttendeeEnrollment",
+    "enrollment.LeaderEnrollment",
+)
+
+# The announcement and resource models live outside this app; deployments
+# declare them per widget in FACTION_WIDGET_INVALIDATED_BY.
+get_leader_metrics = CachedWidgetData(
+    "leader_metrics",
+    dashboard_data.get_leader_metrics,
+    ttl=60 * 5,
+    invalidated_by=("faction.LeaderProfile", "faction.AttendeeProfile", *ENROLLMENT_MODELS),
+)
+get_faction_enrollment_counts = CachedWidgetData(
+    "faction_enrollment_counts",
+    dashboard_data.get_faction_enrollment_counts,
+    ttl=60 * 5,
+    invalidated_by=ENROLLMENT_MODELS,
+)
+get_leader_resource_links = CachedWidgetData(
+    "leader_resource_links",
+    dashboard_data.get_leader_resource_links,
+    ttl=60 * 60,
+    invalidated_by=("faction.Faction",),
+)
+get_attendee_announcements = CachedWidgetData(
+    "attendee_announcements",
+    dashboard_data.get_attendee_announcements,
+    ttl=60 * 5,
+    invalidated_by=("faction.Faction",),
+)
+get_attendee_resources = CachedWidgetData(
+    "attendee_resources",
+    dashboard_data.get_attendee_resources,
+    ttl=60 * 60,
+    invalidated_by=("faction.Faction",),
+)
@@ -0,0 +1,123 @@
+# faction/exporters.py
+""" Streaming Faction Exports. """
+
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models.attendee import AttendeeProfile
+from .models.faction import Faction
+from .models.leader import LeaderProfile
+from .querysets.roster import roster_queryset
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # XLSX export is optional
+    Workbook = None
+
+FACTION_EXPORT_FIELDS = (
+    "id",
+    "parent_id",
+    "organization_id",
+    "slug",
+    "name",
+    "abbreviation",
+    "description",
+    "depth",
+    "path",
+)
+PROFILE_EXPORT_FIELDS = (
+    "id",
+    "slug",
+    "faction_id",
+    "organization_id",
+    "user_id",
+    "user__username",
+    "user__first_name",
+    "user__last_name",
+    "user__email",
+)
+# (roster column, header) pairs matching the columns of ``RosterTable``.
+ROSTER_EXPORT_COLUMNS = (
+    ("username", "Username"),
+    ("first_name", "First Name"),
+    ("last_name", "Last Name"),
+    ("email", "Email"),
+    ("user_type", "User Type"),
+    ("faction_name", "Faction"),
+)
+
+
+def iter_subtree_records(faction, chunk_size=2000):
+    """
+    Yield ``(type, row)`` for every faction, leader and attendee in the subtree.
+
+    Rows come from ``.values().iterator(chunk_size=...)``, so memory stays flat
+    no matter how many profiles the subtree holds.
+    """
+    factions = Faction.objects.filter(id__in=faction.get_descendant_ids()).order_by("path")
+    for row in factions.values(*FACTION_EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+        yield "faction", row
+
+    leaders = LeaderProfile.objects.in_subtree(faction).order_by("pk")
+    for row in leaders.values(*PROFILE_EXPORT_FIELDS, "is_admin").iterator(chunk_size=chunk_size):
+        yield "leader", row
+
+    attendees = AttendeeProfile.objects.in_subtree(faction).order_by("pk")
+    for row in attendees.values(*PROFILE_EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+        yield "attendee", row
+
+
+def iter_subtree_jsonl(faction, chunk_size=2000):
+    """
+    Yield the subtree export as JSON Lines, one record per line.
+    """
+    for record_type, row in iter_subtree_records(faction, chunk_size=chunk_size):
+        yield json.dumps({"type": record_type, **row}, cls=DjangoJSONEncoder) + "\n"
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the formatted CSV line back."""
+
+    def write(self, value):
+        return value
+
+
+def iter_roster_rows(faction, chunk_size=2000):
+    """
+    Yield the roster header, then one list of values per leader or attendee.
+
+    Rows are read with ``.iterator()`` from the roster ``UNION ALL``, which
+    selects only the table's columns.
+    """
+    fields = [field for field, _ in ROSTER_EXPORT_COLUMNS]
+    yield [header for _, header in ROSTER_EXPORT_COLUMNS]
+    roster = roster_queryset(faction).order_by("username", "member_type", "member_id")
+    for row in roster.iterator(chunk_size=chunk_size):
+        yield [row[field] for field in fields]
+
+
+def iter_roster_csv(faction, chunk_size=2000):
+    """
+    Yield the subtree roster as CSV, one line at a time.
+    """
+    writer = csv.writer(_Echo())
+    for row in iter_roster_rows(faction, chunk_size=chunk_size):
+        yield writer.writerow(row)
+
+
+def write_roster_xlsx(faction, stream, chunk_size=2000):
+    """
+    Write the subtree roster to ``stream`` as an XLSX workbook.
+
+    Uses openpyxl's write-only mode, which flushes rows to disk as they are
+    appended instead of holding the sheet in memory.
+    """
+    if Workbook is None:
+        raise RuntimeError("XLSX export requires openpyxl.")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title="Roster")
+    for row in iter_roster_rows(faction, chunk_size=chunk_size):
+        sheet.append(row)
+    workbook.save(stream)
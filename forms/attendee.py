@@ -28,16 +28,10 @@ class AttendeeForm(ProfileUserFieldsMixin):
 
     def __init__(self, *args, scope_faction=None, **kwargs):
         super().__init__(*args, **kwargs)
-        qs = Faction.objects.filter(is_deleted=False)
+        qs = Faction.objects.filter(is_deleted=False).select_related("organization")
         if scope_faction:
             # limit to the scope faction and its descendants
-            ids = []
-            stack = [scope_faction]
-            while stack:
-                current = stack.pop()
-                ids.append(current.id)
-                stack.extend(list(current.children.all()))
-            qs = qs.filter(id__in=ids)
+            qs = qs.filter(id__in=scope_faction.get_descendant_ids())
         self.fields["faction"].queryset = qs
 
     class Meta:
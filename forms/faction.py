@@ -8,9 +8,9 @@ from ..models.faction import Faction
 class FactionForm(forms.ModelForm):
     class Meta:
         model = Faction
-        fields = ["name", "description", "organization"]
+        fields = ["name", "description", "organization", "parent"]
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, organization=None, **kwargs):
         super(FactionForm, self).__init__(*args, **kwargs)
         self.fields["name"].widget.attrs.update(
             {"class": "form-control", "placeholder": "Enter faction name"}
@@ -18,6 +18,18 @@ class FactionForm(forms.ModelForm):
         self.fields["description"].widget.attrs.update(
             {"class": "form-control", "placeholder": "Describe the faction"}
         )
+        # Parents are only offered within the organization and never from the own subtree
+        organization_id = (
+            self.instance.organization_id if self.instance.pk else getattr(organization, "pk", None)
+        )
+        parents = Faction.objects.filter(
+            is_deleted=False, organization_id=organization_id
+        ).select_related("organization")
+        if self.instance.pk:
+            parents = parents.exclude(id__in=self.instance.get_descendant_ids())
+        self.fields["parent"].queryset = parents
+        self.fields["parent"].required = False
+        self.fields["parent"].widget.attrs.update({"class": "form-control"})
 
     def clean(self):
         cleaned_data = super().clean()
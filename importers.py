@@ -0,0 +1,233 @@
+# faction/importers.py
+""" Bulk Faction Tree Import. """
+
+import csv
+import io
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.text import slugify
+
+from .cache import TREE_VERSION, bump_subtree_versions, bump_version
+from .models.closure import FactionClosure
+from .models.faction import Faction
+
+IMPORT_FIELDS = ("name", "description", "abbreviation", "slug")
+
+
+class FactionTreeImporter:
+    """
+    Import a whole faction tree into one organization.
+
+    Parents are resolved in memory, slugs are generated in bulk against a
+    single read of the organization's existing slugs, and rows are inserted
+    level by level with ``bulk_create`` inside one transaction.
+
+    Each record is a dict with a ``key``, the ``parent_key`` of another
+    record (or ``None``), an optional ``parent_id`` of an existing faction,
+    and the ``IMPORT_FIELDS``.
+    """
+
+    batch_size = 500
+
+    def __init__(self, organization, parent=None):
+        if parent is not None and parent.organization_id != organization.pk:
+            raise ValidationError("The import parent must belong to the organization.")
+        self.organization = organization
+        self.parent = parent
+
+    def import_json(self, data):
+        """
+        Import nested JSON: a node or a list of nodes, each with optional ``children``.
+        """
+        records = []
+
+        def walk(node, parent_key):
+            if not isinstance(node, dict) or not node.get("name"):
+                raise ValidationError("Every faction node needs a name.")
+            key = len(records)
+            records.append({"key": key, "parent_key": parent_key, **self._fields(node)})
+            for child in node.get("children") or []:
+                walk(child, key)
+
+        for node in data if isinstance(data, list) else [data]:
+            walk(node, None)
+        return self.run(records)
+
+    def import_csv(self, stream):
+        """
+        Import a CSV whose ``id`` and ``parent`` columns reference other rows.
+
+        A ``parent`` that matches no row is looked up as the slug of an
+        existing faction in the organization.
+        """
+        if isinstance(stream, bytes):
+            stream = stream.decode("utf-8-sig")
+        if isinstance(stream, str):
+            stream = io.StringIO(stream)
+        rows = list(csv.DictReader(stream))
+
+        keys = {row.get("id") for row in rows}
+        external = {row["parent"] for row in rows if row.get("parent") and row["parent"] not in keys}
+        existing = dict(
+            Faction.objects.filter(
+                organization=self.organization, slug__in=external, is_deleted=False
+            ).values_list("slug", "pk")
+        )
+        missing = external - set(existing)
+        if missing:
+            raise ValidationError(f"Unknown parent references: {', '.join(sorted(missing))}.")
+
+        records = []
+        for row in rows:
+            if not row.get("id") or not row.get("name"):
+                raise ValidationError("Every CSV row needs an id and a name.")
+            parent = row.get("parent") or None
+            records.append(
+                {
+                    "key": row["id"],
+                    "parent_key": parent if parent in keys else None,
+                    "parent_id": existing.get(parent),
+                    **self._fields(row),
+                }
+            )
+        return self.run(records)
+
+    def run(self, records):
+        """
+        Insert ``records`` and return the created factions in insertion order.
+        """
+        levels = self._levels(records)
+        anchors = self._anchors(records)
+        self._assign_slugs(records)
+
+        # Depth of every record, known before anything is written.
+        depths = {}
+        for level in levels:
+            for record in level:
+                if record["parent_key"] is not None:
+                    depths[record["key"]] = depths[record["parent_key"]] + 1
+                else:
+                    anchor = anchors.get(record["parent_id"])
+                    depths[record["key"]] = anchor.depth + 1 if anchor else 0
+        max_faction_depth = self.organization.get_setting("max_faction_depth", default=2)
+        if depths and max(depths.values()) > max_faction_depth:
+            raise ValidationError(
+                f"Max faction depth of {max_faction_depth} exceeded for organization "
+                f"'{self.organization.name}'."
+            )
+
+        created = []
+        closure = []
+        by_key = {}
+        with transaction.atomic():
+            for level in levels:
+                parents = [
+                    by_key[record["parent_key"]]
+                    if record["parent_key"] is not None
+                    else anchors.get(record["parent_id"])
+                    for record in level
+                ]
+                factions = [
+                    Faction(
+                        organization=self.organization,
+                        parent_id=parent.pk if parent else None,
+                        depth=depths[record["key"]],
+                        name=record["name"],
+                        description=record["description"],
+                        abbreviation=record["abbreviation"] or None,
+                        slug=record["slug"],
+                    )
+                    for record, parent in zip(level, parents)
+                ]
+                Faction.objects.bulk_create(factions, batch_size=self.batch_size)
+
+                for record, parent, faction in zip(level, parents, factions):
+                    faction.root_id = (parent.root_id or parent.pk) if parent else faction.pk
+                    faction.path = Faction.build_path(parent.path if parent else "", faction.pk)
+                    faction.lineage = (parent.lineage if parent else []) + [faction.pk]
+                    closure.extend(
+                        FactionClosure(ancestor_id=ancestor_id, descendant_id=faction.pk, depth=depth)
+                        for depth, ancestor_id in enumerate(reversed(faction.lineage))
+                    )
+                    by_key[record["key"]] = faction
+                Faction.objects.bulk_update(factions, ["root", "path"], batch_size=self.batch_size)
+                created.extend(factions)
+
+            FactionClosure.objects.bulk_create(closure, batch_size=self.batch_size)
+            organization_id = self.organization.pk
+            transaction.on_commit(lambda: bump_version(TREE_VERSION, organization_id))
+            # Bulk writes send no signals, so the anchors' subtree caches are invalidated here.
+            bump_subtree_versions(*anchors)
+        return created
+
+    def _fields(self, source):
+        return {field: (source.get(field) or "").strip() for field in IMPORT_FIELDS}
+
+    def _levels(self, records):
+        """
+        Group records into topological levels, rejecting unknown parents and cycles.
+        """
+        by_key = {}
+        for record in records:
+            if record["key"] in by_key:
+                raise ValidationError(f"Duplicate faction key '{record['key']}'.")
+            by_key[record["key"]] = record
+            if record["parent_key"] is None and not record.get("parent_id") and self.parent:
+                record["parent_id"] = self.parent.pk
+            record.setdefault("parent_id", None)
+
+        children = {}
+        for record in records:
+            if record["parent_key"] is not None and record["parent_key"] not in by_key:
+                raise ValidationError(f"Unknown parent '{record['parent_key']}'.")
+            children.setdefault(record["parent_key"], []).append(record)
+
+        levels = []
+        current = children.get(None, [])
+        while current:
+            levels.append(current)
+            current = [child for record in current for child in children.get(record["key"], [])]
+        if sum(len(level) for level in levels) != len(records):
+            raise ValidationError("The faction tree contains a cycle.")
+        return levels
+
+    def _anchors(self, records):
+        """
+        Load the existing factions the import hangs from, with their closure lineage.
+
+        Anchors must be live factions of the organization.
+        """
+        ids = {record["parent_id"] for record in records} - {None}
+        anchors = {
+            faction.pk: faction
+            for faction in Faction.objects.filter(
+                pk__in=ids, organization=self.organization, is_deleted=False
+            )
+        }
+        missing = ids - set(anchors)
+        if missing:
+            raise ValidationError(
+                f"Unknown parent factions: {', '.join(str(pk) for pk in sorted(missing))}."
+            )
+        lineages = {}
+        for link in FactionClosure.objects.filter(descendant_id__in=ids).order_by("-depth"):
+            lineages.setdefault(link.descendant_id, []).append(link.ancestor_id)
+        for pk, faction in anchors.items():
+            faction.lineage = lineages.get(pk, [pk])
+        return anchors
+
+    def _assign_slugs(self, records):
+        """
+        Generate unique slugs in memory against one read of the existing slugs.
+        """
+        taken = set(
+            Faction.objects.filter(organization=self.organization).values_list("slug", flat=True)
+        )
+        for record in records:
+            base = slugify(record["slug"] or record["name"])[:240] or "faction"
+            slug, counter = base, 2
+            while slug in taken:
+                slug, counter = f"{base}-{counter}", counter + 1
+            taken.add(slug)
+            record["slug"] = slug
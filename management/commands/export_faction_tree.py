@@ -0,0 +1,39 @@
+# faction/management/commands/export_faction_tree.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from faction.exporters import iter_subtree_jsonl
+from faction.models.faction import Faction
+
+
+class Command(BaseCommand):
+    help = "Stream a faction subtree with its leaders and attendees as JSON Lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument("faction", help="Id or slug of the subtree root.")
+        parser.add_argument(
+            "--organization", help="Organization slug, required when the faction slug is ambiguous."
+        )
+        parser.add_argument("--output", help="File to write to (defaults to stdout).")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        lookup = options["faction"]
+        factions = Faction.objects.filter(
+            **({"pk": lookup} if lookup.isdigit() else {"slug": lookup})
+        )
+        if options["organization"]:
+            factions = factions.filter(organization__slug=options["organization"])
+        matches = list(factions[:2])
+        if not matches:
+            raise CommandError(f"Faction '{lookup}' not found.")
+        if len(matches) > 1:
+            raise CommandError(f"Faction '{lookup}' is ambiguous; pass --organization.")
+
+        lines = iter_subtree_jsonl(matches[0], chunk_size=options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as stream:
+                stream.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,61 @@
+# faction/management/commands/import_factions.py
+
+import json
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from organization.models.organization import Organization
+
+from faction.importers import FactionTreeImporter
+from faction.models.faction import Faction
+
+
+class Command(BaseCommand):
+    help = "Import a faction tree from nested JSON or a parent-reference CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSON or CSV file to import.")
+        parser.add_argument(
+            "--organization", required=True, help="Slug or id of the target organization."
+        )
+        parser.add_argument("--parent", help="Slug of an existing faction to import under.")
+        parser.add_argument(
+            "--format", choices=["json", "csv"], help="Input format (defaults to the file extension)."
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+
+        lookup = options["organization"]
+        organization = Organization.objects.filter(
+            **({"pk": lookup} if lookup.isdigit() else {"slug": lookup})
+        ).first()
+        if organization is None:
+            raise CommandError(f"Organization '{lookup}' not found.")
+
+        parent = None
+        if options["parent"]:
+            parent = Faction.objects.filter(
+                organization=organization, slug=options["parent"]
+            ).first()
+            if parent is None:
+                raise CommandError(f"Faction '{options['parent']}' not found.")
+
+        importer = FactionTreeImporter(organization, parent=parent)
+        file_format = options["format"] or path.suffix.lstrip(".").lower()
+        try:
+            if file_format == "json":
+                created = importer.import_json(json.loads(path.read_text(encoding="utf-8")))
+            elif file_format == "csv":
+                with path.open(newline="", encoding="utf-8-sig") as stream:
+                    created = importer.import_csv(stream)
+            else:
+                raise CommandError("Unknown format; pass --format json or --format csv.")
+        except (ValidationError, json.JSONDecodeError) as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {len(created)} factions."))
@@ -0,0 +1,26 @@
+# faction/management/commands/rebuild_member_search_index.py
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from faction.search_index import rebuild_member_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Refill the SQLite member search table from the user table, e.g. after "
+        "bulk updates that bypassed model signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        with transaction.atomic(using=using):
+            rebuilt = rebuild_member_search_index(get_user_model()._meta.db_table, using)
+        if rebuilt:
+            self.stdout.write(self.style.SUCCESS("Member search index rebuilt."))
+        else:
+            self.stdout.write("This database searches members without a search table.")
@@ -0,0 +1,94 @@
+# faction/management/commands/reconcile_faction_counts.py
+
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from faction.models.attendee import AttendeeProfile
+from faction.models.faction import Faction
+from faction.models.leader import LeaderProfile
+
+MEMBER_MODELS = (("attendee", AttendeeProfile), ("leader", LeaderProfile))
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute per-faction and per-subtree member counts with grouped queries, "
+        "report drift against the stored counters and fix it in locked batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--organization", type=int, help="Only reconcile this organization id.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report drift without writing fixes."
+        )
+
+    def handle(self, *args, **options):
+        organization_id = options["organization"]
+        batch_size = options["batch_size"]
+
+        factions = Faction.objects.all()
+        if organization_id:
+            factions = factions.filter(organization_id=organization_id)
+        faction_ids = list(factions.order_by("pk").values_list("pk", flat=True))
+
+        drifted = 0
+        for start in range(0, len(faction_ids), batch_size):
+            batch = faction_ids[start:start + batch_size]
+            # One short transaction per batch keeps row locks brief. The batch
+            # is recounted while its rows are locked, so F() shifts by profile
+            # signals either land before the recount or wait for the write.
+            with transaction.atomic():
+                rows = Faction.objects.filter(pk__in=batch).order_by("pk")
+                if not options["dry_run"]:
+                    rows = rows.select_for_update()
+                # Evaluated here so the lock is held before the recount reads.
+                stored = list(rows.values_list("pk", *Faction.COUNTER_FIELDS))
+                expected = self.compute_counts(batch)
+                fixes = self.find_drift(stored, expected, options["verbosity"])
+                if fixes and not options["dry_run"]:
+                    Faction.objects.bulk_update(fixes, Faction.COUNTER_FIELDS)
+            drifted += len(fixes)
+
+        self.stdout.write(f"{drifted} factions with drifted counters.")
+        if drifted and not options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {drifted} factions."))
+
+    def find_drift(self, stored_rows, expected, verbosity=1):
+        """
+        Return unsaved ``Faction`` instances carrying the expected counters of drifted rows.
+        """
+        fixes = []
+        for pk, *stored in stored_rows:
+            actual = tuple(expected[field][pk] for field in Faction.COUNTER_FIELDS)
+            if tuple(stored) != actual:
+                fixes.append(Faction(pk=pk, **dict(zip(Faction.COUNTER_FIELDS, actual))))
+                if verbosity > 1:
+                    self.stdout.write(f"Faction {pk}: stored {tuple(stored)}, expected {actual}")
+        return fixes
+
+    def compute_counts(self, faction_ids):
+        """
+        Return ``{counter_field: Counter(faction_id -> count)}`` for ``faction_ids``.
+
+        Each counter comes from one grouped query.
+        """
+        counts = {}
+        for member_type, model in MEMBER_MODELS:
+            direct = model.objects.filter(faction_id__in=faction_ids)
+            subtree = model.objects.filter(faction__ancestor_links__ancestor_id__in=faction_ids)
+
+            counts[f"{member_type}_count"] = Counter(
+                dict(direct.values_list("faction_id").annotate(total=Count("pk")).order_by())
+            )
+            counts[f"subtree_{member_type}_count"] = Counter(
+                dict(
+                    subtree.values_list("faction__ancestor_links__ancestor_id")
+                    .annotate(total=Count("pk"))
+                    .order_by()
+                )
+            )
+        return counts
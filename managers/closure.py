@@ -0,0 +1,73 @@
+# faction/managers/closure.py
+
+from django.db import connections, models
+
+from ..querysets.closure import FactionClosureQuerySet
+
+
+class FactionClosureManager(models.Manager):
+    """Faction Closure Manager."""
+
+    def get_queryset(self):
+        return FactionClosureQuerySet(self.model, using=self._db)
+
+    def descendant_ids(self, faction, include_self=True):
+        return self.get_queryset().descendant_ids(faction, include_self)
+
+    def ancestor_ids(self, faction, include_self=False):
+        return self.get_queryset().ancestor_ids(faction, include_self)
+
+    def insert_node(self, faction):
+        """
+        Add closure rows for a newly created faction.
+
+        The faction gets its self-link plus one link per ancestor of its
+        parent. Soft-deleted factions are only linked to themselves.
+        """
+        links = [self.model(ancestor_id=faction.pk, descendant_id=faction.pk, depth=0)]
+        if faction.parent_id and not faction.is_deleted:
+            links.extend(
+                self.model(ancestor_id=ancestor_id, descendant_id=faction.pk, depth=depth + 1)
+                for ancestor_id, depth in self.filter(
+                    descendant_id=faction.parent_id
+                ).values_list("ancestor_id", "depth")
+            )
+        self.bulk_create(links)
+
+    def detach_subtree(self, faction):
+        """
+        Remove every link between the subtree of ``faction`` and the nodes above it.
+        """
+        subtree = self.filter(ancestor_id=faction.pk).values("descendant_id")
+        self.filter(descendant_id__in=subtree).exclude(ancestor_id__in=subtree).delete()
+
+    def attach_subtree(self, faction):
+        """
+        Link the subtree of ``faction`` to every ancestor of its current parent.
+
+        Runs as a single ``INSERT ... SELECT`` over the cross product of the
+        parent's ancestor rows and the subtree rows.
+        """
+        if not faction.parent_id:
+            return
+        table = connections[self.db].ops.quote_name(self.model._meta.db_table)
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (ancestor_id, descendant_id, depth) "
+                f"SELECT supertree.ancestor_id, subtree.descendant_id, "
+                f"supertree.depth + subtree.depth + 1 "
+                f"FROM {table} supertree, {table} subtree "
+                f"WHERE supertree.descendant_id = %s AND subtree.ancestor_id = %s",
+                [faction.parent_id, faction.pk],
+            )
+
+    def move_subtree(self, faction):
+        """
+        Re-link the subtree of ``faction`` under its current parent.
+
+        Soft-deleted factions stay detached so their subtree drops out of every
+        lookup made from above.
+        """
+        self.detach_subtree(faction)
+        if not faction.is_deleted:
+            self.attach_subtree(faction)
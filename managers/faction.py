@@ -1,5 +1,8 @@
 # faction/managers/faction.py
 
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
+
 from pages.managers import AbstractBaseManager
 
 from ..querysets.faction import FactionQuerySet
@@ -29,8 +32,96 @@ class FactionManager(AbstractBaseManager):
     def by_faction(self, faction_id):
         return self.get_queryset().by_faction(faction_id)
 
+    def descendants_of(self, faction, include_self=True):
+        return self.get_queryset().descendants_of(faction, include_self)
+
+    def ancestors_of(self, faction):
+        return self.get_queryset().ancestors_of(faction)
+
+    def with_ancestors(self):
+        return self.get_queryset().with_ancestors()
+
+    def within(self, faction, include_self=True):
+        return self.get_queryset().within(faction, include_self)
+
+    def repath_subtree(self, old_path, new_path, depth_delta, root_id):
+        """
+        Rewrite path, depth and root for every descendant below ``old_path``.
+
+        Runs as a single UPDATE no matter how large the moved subtree is.
+        """
+        prefix = f"{old_path}{self.model.PATH_SEPARATOR}"
+        return self.get_queryset().filter(path__startswith=prefix).update(
+            path=Concat(Value(new_path), Substr("path", len(old_path) + 1)),
+            depth=F("depth") + depth_delta,
+            root_id=root_id,
+        )
+
+    def adjust_member_count(self, faction_id, member_type, delta):
+        """
+        Shift the ``member_type`` counters of a faction and of its ancestors by ``delta``.
+        """
+        if not faction_id or not delta:
+            return
+        direct, subtree = f"{member_type}_count", f"subtree_{member_type}_count"
+        self.get_queryset().filter(pk=faction_id).update(**{direct: F(direct) + delta})
+        self.get_queryset().filter(descendant_links__descendant_id=faction_id).update(
+            **{subtree: F(subtree) + delta}
+        )
+
+    def move_member(self, old_faction_id, new_faction_id, member_type):
+        """
+        Update counters for a profile that left ``old_faction_id`` and joined ``new_faction_id``.
+        """
+        if old_faction_id == new_faction_id:
+            return
+        self.adjust_member_count(old_faction_id, member_type, -1)
+        self.adjust_member_count(new_faction_id, member_type, 1)
+
+    def shift_ancestor_counts(self, faction, sign):
+        """
+        Add (``sign=1``) or remove (``sign=-1``) a subtree's totals on its current ancestors.
+        """
+        attendees, leaders = self.get_queryset().values_list(
+            "subtree_attendee_count", "subtree_leader_count"
+        ).get(pk=faction.pk)
+        if not attendees and not leaders:
+            return
+        self.get_queryset().filter(
+            descendant_links__descendant_id=faction.pk, descendant_links__depth__gt=0
+        ).update(
+            subtree_attendee_count=F("subtree_attendee_count") + sign * attendees,
+            subtree_leader_count=F("subtree_leader_count") + sign * leaders,
+        )
+
+    def release_member_counts(self, faction):
+        """
+        Remove a faction's own members from the subtree counters of its ancestors.
+
+        Runs before a hard delete, which detaches the members without any
+        profile signal. Each deleted faction releases only its direct members,
+        so a cascade over a whole subtree subtracts every member exactly once.
+        """
+        fields = [f"{member_type}_count" for member_type in self.model.MEMBER_TYPES]
+        direct = self.get_queryset().values(*fields).get(pk=faction.pk)
+        changes = {
+            f"subtree_{field}": F(f"subtree_{field}") - direct[field]
+            for field in fields
+            if direct[field]
+        }
+        if changes:
+            self.get_queryset().filter(
+                descendant_links__descendant_id=faction.pk, descendant_links__depth__gt=0
+            ).update(**changes)
+
     def with_member_count(self, include_descendants=True):
         return self.get_queryset().with_member_count(include_descendants)
 
+    def with_subtree_member_counts(self):
+        return self.get_queryset().with_subtree_member_counts()
+
+    def with_member_counts(self, include_descendants=True, prefix="total_"):
+        return self.get_queryset().with_member_counts(include_descendants, prefix)
+
     def with_sub_faction_count(self):
         return self.get_queryset().with_sub_faction_count()
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_faction_closure(apps, schema_editor):
+    Faction = apps.get_model("faction", "Faction")
+    FactionClosure = apps.get_model("faction", "FactionClosure")
+    db_alias = schema_editor.connection.alias
+
+    nodes = {
+        pk: (parent_id, is_deleted)
+        for pk, parent_id, is_deleted in Faction.objects.using(db_alias).values_list(
+            "id", "parent_id", "is_deleted"
+        )
+    }
+    links = []
+    for pk in nodes:
+        links.append(FactionClosure(ancestor_id=pk, descendant_id=pk, depth=0))
+        current, depth = pk, 0
+        # Soft-deleted factions stay detached from the nodes above them.
+        while not nodes[current][1] and nodes[current][0] in nodes:
+            current, depth = nodes[current][0], depth + 1
+            links.append(FactionClosure(ancestor_id=current, descendant_id=pk, depth=depth))
+    FactionClosure.objects.using(db_alias).bulk_create(links, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faction", "0020_leaderprofile_is_admin"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FactionClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("depth", models.PositiveIntegerField(default=0)),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_links",
+                        to="faction.faction",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ancestor_links",
+                        to="faction.faction",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Faction Closure",
+                "verbose_name_plural": "Faction Closures",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ancestor", "descendant"),
+                        name="unique_faction_closure_link",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_faction_closure, migrations.RunPython.noop),
+    ]
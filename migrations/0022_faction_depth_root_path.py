@@ -0,0 +1,70 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+PATH_SEPARATOR = "."
+PATH_STEP_LENGTH = 10
+
+
+def populate_tree_position(apps, schema_editor):
+    Faction = apps.get_model("faction", "Faction")
+    db_alias = schema_editor.connection.alias
+
+    factions = {faction.pk: faction for faction in Faction.objects.using(db_alias).only("id", "parent_id")}
+    resolved = {}
+
+    def resolve(faction):
+        if faction.pk in resolved:
+            return resolved[faction.pk]
+        step = str(faction.pk).zfill(PATH_STEP_LENGTH)
+        parent = factions.get(faction.parent_id)
+        if parent is None:
+            position = (0, faction.pk, step)
+        else:
+            depth, root_id, path = resolve(parent)
+            position = (depth + 1, root_id, f"{path}{PATH_SEPARATOR}{step}")
+        resolved[faction.pk] = position
+        return position
+
+    for faction in factions.values():
+        faction.depth, faction.root_id, faction.path = resolve(faction)
+    Faction.objects.using(db_alias).bulk_update(
+        factions.values(), ["depth", "root", "path"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faction", "0021_factionclosure"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="faction",
+            name="depth",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="faction",
+            name="path",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=255
+            ),
+        ),
+        migrations.AddField(
+            model_name="faction",
+            name="root",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="faction.faction",
+            ),
+        ),
+        migrations.RunPython(populate_tree_position, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:00
+
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def populate_member_counters(apps, schema_editor):
+    Faction = apps.get_model("faction", "Faction")
+    FactionClosure = apps.get_model("faction", "FactionClosure")
+    AttendeeProfile = apps.get_model("faction", "AttendeeProfile")
+    LeaderProfile = apps.get_model("faction", "LeaderProfile")
+    db_alias = schema_editor.connection.alias
+
+    direct = {}
+    for member_type, model in (("attendee", AttendeeProfile), ("leader", LeaderProfile)):
+        direct[member_type] = Counter(
+            model.objects.using(db_alias)
+            .filter(faction__isnull=False)
+            .values_list("faction_id", flat=True)
+        )
+
+    subtree = {member_type: Counter() for member_type in direct}
+    for ancestor_id, descendant_id in FactionClosure.objects.using(db_alias).values_list(
+        "ancestor_id", "descendant_id"
+    ):
+        for member_type, counts in direct.items():
+            subtree[member_type][ancestor_id] += counts[descendant_id]
+
+    factions = list(Faction.objects.using(db_alias).only("id"))
+    for faction in factions:
+        faction.attendee_count = direct["attendee"][faction.pk]
+        faction.leader_count = direct["leader"][faction.pk]
+        faction.subtree_attendee_count = subtree["attendee"][faction.pk]
+        faction.subtree_leader_count = subtree["leader"][faction.pk]
+    Faction.objects.using(db_alias).bulk_update(
+        factions,
+        ["attendee_count", "leader_count", "subtree_attendee_count", "subtree_leader_count"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("faction", "0022_faction_depth_root_path"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="faction",
+            name="attendee_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="faction",
+            name="leader_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="faction",
+            name="subtree_attendee_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="faction",
+            name="subtree_leader_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_member_counters, migrations.RunPython.noop),
+    ]
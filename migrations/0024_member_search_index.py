@@ -0,0 +1,63 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:00
+
+from django.conf import settings
+from django.db import migrations
+
+try:
+    from django.contrib.postgres.operations import TrigramExtension
+except ImportError:  # psycopg is only installed for Postgres deployments.
+    TrigramExtension = None
+
+SEARCH_TABLE = "faction_member_search"
+SEARCH_FIELDS = ("username", "first_name", "last_name", "email")
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Index member search: trigram GIN indexes on Postgres, an FTS5 table on SQLite.
+
+    The SQLite table keeps its own copy of the columns; ``faction.search_index``
+    keeps it in step with the user table.
+    """
+    connection = schema_editor.connection
+    quote = schema_editor.quote_name
+    user_table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+
+    if connection.vendor == "postgresql":
+        for field in SEARCH_FIELDS:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {quote(f'faction_member_{field}_trgm')} "
+                f"ON {quote(user_table)} USING gin (UPPER({quote(field)}::text) gin_trgm_ops)"
+            )
+    elif connection.vendor == "sqlite":
+        columns = ", ".join(SEARCH_FIELDS)
+        values = ", ".join(f"COALESCE({quote(field)}, '')" for field in SEARCH_FIELDS)
+        table = quote(SEARCH_TABLE)
+        schema_editor.execute(f"CREATE VIRTUAL TABLE {table} USING fts5({columns})")
+        schema_editor.execute(
+            f"INSERT INTO {table}(rowid, {columns}) SELECT id, {values} FROM {quote(user_table)}"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    quote = schema_editor.quote_name
+    if connection.vendor == "postgresql":
+        for field in SEARCH_FIELDS:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {quote(f'faction_member_{field}_trgm')}")
+    elif connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {quote(SEARCH_TABLE)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("faction", "0023_faction_member_counters"),
+    ]
+
+    operations = [
+        # TrigramExtension only runs on Postgres.
+        *([TrigramExtension()] if TrigramExtension is not None else []),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,5 +1,6 @@
 from .faction import Faction
+from .closure import FactionClosure
 from .leader import LeaderProfile
 from .attendee import AttendeeProfile
 
-__all__ = ["Faction", "LeaderProfile", "AttendeeProfile"]
+__all__ = ["Faction", "FactionClosure", "LeaderProfile", "AttendeeProfile"]
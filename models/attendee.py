@@ -2,9 +2,15 @@
 """ Attendee Related Models. """
 
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from enrollment.models.attendee import AttendeeEnrollment
-from user.models import BaseUserProfile
+from user.models import BaseUserProfile, User
+
+from faction.cache import MEMBER_USER_FIELDS, bump_subtree_versions
+from faction.models.faction import Faction
+from faction.querysets.profile import ProfileQuerySet
 
 
 class AttendeeProfile(BaseUserProfile):
@@ -26,6 +32,14 @@ class AttendeeProfile(BaseUserProfile):
         "faction.Faction", on_delete=models.SET_NULL, null=True, blank=True
     )
 
+    objects = ProfileQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_faction_id = instance.__dict__.get("faction_id")
+        return instance
+
     def get_fallback_chain(self):
         return ["faction", "faction.organization"]
 
@@ -39,3 +53,35 @@ class AttendeeProfile(BaseUserProfile):
     def get_absolute_url(self):
         from django.urls import reverse
         return reverse("attendees:show", kwargs={"slug": self.slug})
+
+
+@receiver(post_save, sender=AttendeeProfile)
+def track_attendee_faction_counts(sender, instance, created, raw=False, **kwargs):
+    """Keep faction attendee counters and cached member tables in step with the profile."""
+    if raw:
+        return
+    if created:
+        old_faction_id = None
+    else:
+        old_faction_id = getattr(instance, "_loaded_faction_id", instance.faction_id)
+    if old_faction_id != instance.faction_id:
+        Faction.objects.move_member(old_faction_id, instance.faction_id, "attendee")
+    # Any profile edit may change what cached member tables show.
+    bump_subtree_versions(old_faction_id, instance.faction_id)
+    instance._loaded_faction_id = instance.faction_id
+
+
+@receiver(post_delete, sender=AttendeeProfile)
+def release_attendee_faction_counts(sender, instance, **kwargs):
+    Faction.objects.adjust_member_count(instance.faction_id, "attendee", -1)
+    bump_subtree_versions(instance.faction_id)
+
+
+@receiver(post_save, sender=User)
+def bump_attendee_user_versions(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Invalidate cached member tables of the user's attendee factions when shown fields change."""
+    if raw or (update_fields is not None and not MEMBER_USER_FIELDS & set(update_fields)):
+        return
+    bump_subtree_versions(
+        *AttendeeProfile.objects.filter(user=instance).values_list("faction_id", flat=True)
+    )
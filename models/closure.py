@@ -0,0 +1,38 @@
+# faction/models/closure.py
+""" Faction Hierarchy Models. """
+
+from django.db import models
+
+from faction.managers.closure import FactionClosureManager
+
+
+class FactionClosure(models.Model):
+    """
+    Transitive closure of the Faction tree.
+
+    Each faction has one row per ancestor, plus a depth-0 row for itself, so
+    a subtree or an ancestor chain resolves with a single indexed lookup.
+    """
+
+    ancestor = models.ForeignKey(
+        "faction.Faction", on_delete=models.CASCADE, related_name="descendant_links"
+    )
+    descendant = models.ForeignKey(
+        "faction.Faction", on_delete=models.CASCADE, related_name="ancestor_links"
+    )
+    depth = models.PositiveIntegerField(default=0)
+
+    objects = FactionClosureManager()
+
+    class Meta:
+        verbose_name = "Faction Closure"
+        verbose_name_plural = "Faction Closures"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ancestor", "descendant"],
+                name="unique_faction_closure_link",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
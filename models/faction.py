@@ -2,8 +2,9 @@
 """ Faction Related Models. """
 
 from django.contrib.contenttypes.fields import GenericRelation
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, transaction
+from django.db.models import Count, Max, Q
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.forms import ValidationError
 from django.urls import reverse
@@ -11,9 +12,13 @@ from django.urls import reverse
 from user.models import User
 from core.mixins import models as mixins
 from core.mixins import settings as stgs
+from enrollment.models.attendee import AttendeeEnrollment
 from enrollment.models.faction import FactionEnrollment
+from enrollment.models.leader import LeaderEnrollment
 
+from faction.cache import ENROLLMENT_VERSION, TREE_VERSION, bump_subtree_versions, bump_version
 from faction.managers.faction import FactionManager
+from faction.models.closure import FactionClosure
 
 
 class Faction(
@@ -26,8 +31,35 @@ class Faction(
         "organization.Organization", on_delete=models.CASCADE, related_name="factions"
     )
 
+    # Denormalized tree position, maintained in save() and by subtree re-paths.
+    depth = models.PositiveIntegerField(default=0, editable=False)
+    root = models.ForeignKey(
+        "self", on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name="+"
+    )
+    path = models.CharField(max_length=255, blank=True, default="", editable=False, db_index=True)
+
+    # Denormalized member counters, shifted with F() updates by profile signals.
+    attendee_count = models.IntegerField(default=0, editable=False)
+    leader_count = models.IntegerField(default=0, editable=False)
+    subtree_attendee_count = models.IntegerField(default=0, editable=False)
+    subtree_leader_count = models.IntegerField(default=0, editable=False)
+
     objects = FactionManager()
 
+    PATH_SEPARATOR = "."
+    PATH_STEP_LENGTH = 10
+    # Member types counted per faction, mapped to their profile model.
+    MEMBER_TYPES = {
+        "attendee": "faction.AttendeeProfile",
+        "leader": "faction.LeaderProfile",
+    }
+    COUNTER_FIELDS = (
+        "attendee_count",
+        "leader_count",
+        "subtree_attendee_count",
+        "subtree_leader_count",
+    )
+
     @property
     def enrollments(self):
         """
@@ -43,17 +75,12 @@ class Faction(
 
     def get_depth(self):
         """
-        Calculate the depth of the current node in the tree structure.
+        Return the depth of the current node in the tree structure.
 
         Returns:
             int: The depth of the current node in the tree.
         """
-        depth = 0
-        parent = self.parent
-        while parent:
-            depth += 1
-            parent = parent.parent
-        return depth
+        return self.depth
 
     # def clean(self):
     #     if self.get_depth() >= self.organization.settings.max_faction_depth:
@@ -61,27 +88,167 @@ class Faction(
     #             f"Faction cannot be more than {self.organization.settings.max_faction_depth} levels deep within the organization."
     #         )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_hierarchy = instance._hierarchy_state()
+        instance._loaded_path = instance.__dict__.get("path")
+        return instance
+
+    def _hierarchy_state(self):
+        return (self.__dict__.get("parent_id"), self.__dict__.get("is_deleted"))
+
+    @classmethod
+    def build_path(cls, parent_path, pk):
+        step = str(pk).zfill(cls.PATH_STEP_LENGTH)
+        return f"{parent_path}{cls.PATH_SEPARATOR}{step}" if parent_path else step
+
+    def _set_tree_position(self):
+        """Derive depth, root and path from the parent without walking the tree."""
+        parent = self.parent if self.parent_id else None
+        self.depth = parent.depth + 1 if parent else 0
+        self.root_id = (parent.root_id or parent.pk) if parent else self.pk
+        self.path = self.build_path(parent.path if parent else "", self.pk) if self.pk else ""
+
     def save(self, *args, **kwargs):
         self.clean()
-        super().save(*args, **kwargs)
+        adding = self._state.adding
+        loaded = getattr(self, "_loaded_hierarchy", None)
+        loaded_path = getattr(self, "_loaded_path", None)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "parent" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "depth", "root", "path"}
+        elif update_fields is None and not adding:
+            # Counters are only ever shifted in the database; never write stale copies back.
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+                and field.attname not in deferred
+            ]
 
-    def get_root_faction(self):
-        if self.parent:
-            return self.parent.get_root_faction()
+        with transaction.atomic(using=kwargs.get("using")):
+            old_depth = self.depth
+            self._set_tree_position()
+            super().save(*args, **kwargs)
+            if adding:
+                # The primary key is only known now, so root and path follow the insert.
+                self._set_tree_position()
+                Faction.objects.filter(pk=self.pk).update(root_id=self.root_id, path=self.path)
+                FactionClosure.objects.insert_node(self)
+            elif loaded is not None and loaded != self._hierarchy_state():
+                # Reparented, soft-deleted or restored: re-link the subtree and
+                # move its member totals from the old ancestors to the new ones.
+                Faction.objects.shift_ancestor_counts(self, -1)
+                FactionClosure.objects.move_subtree(self)
+                Faction.objects.shift_ancestor_counts(self, 1)
+                if loaded_path and loaded_path != self.path:
+                    Faction.objects.repath_subtree(
+                        loaded_path, self.path, self.depth - old_depth, self.root_id
+                    )
+        self._loaded_hierarchy = self._hierarchy_state()
+        self._loaded_path = self.path
+
+    def validate_move(self, new_parent):
+        """
+        Check that the subtree can be moved under ``new_parent``.
+
+        Cycles and the organization's depth limit are checked with one
+        aggregate query over the subtree and the target. Unsaved factions are
+        checked as a subtree of one, which is how new factions are placed.
+
+        Raises:
+            ValidationError: If the move would create a cycle, cross organizations
+                or exceed ``max_faction_depth``.
+        """
+        if new_parent is None:
+            return
+        if new_parent.pk == self.pk:
+            raise ValidationError("A faction cannot be its own parent.")
+        if new_parent.organization_id != self.organization_id:
+            raise ValidationError("A faction can only be moved within its organization.")
+
+        in_subtree = Q(path__startswith=f"{self.path}{self.PATH_SEPARATOR}")
+        stats = Faction.objects.filter(in_subtree | Q(pk=new_parent.pk)).aggregate(
+            subtree_depth=Max("depth", filter=in_subtree),
+            target_depth=Max("depth", filter=Q(pk=new_parent.pk)),
+            target_in_subtree=Count("pk", filter=in_subtree & Q(pk=new_parent.pk)),
+        )
+        if stats["target_in_subtree"]:
+            raise ValidationError("A faction cannot be moved below one of its own sub-factions.")
+
+        height = (stats["subtree_depth"] or self.depth) - self.depth
+        max_faction_depth = self.organization.get_setting("max_faction_depth", default=2)
+        if (stats["target_depth"] or 0) + 1 + height > max_faction_depth:
+            raise ValidationError(
+                f"Max faction depth of {max_faction_depth} exceeded for organization "
+                f"'{self.organization.name}'."
+            )
+
+    def move_to(self, new_parent):
+        """
+        Move this faction and its whole subtree under ``new_parent``.
+
+        ``None`` makes the faction a root. Closure links, paths, depths and roots
+        of the subtree are rewritten with a fixed number of set-based statements.
+        """
+        self.validate_move(new_parent)
+        self.parent = new_parent
+        self.save()
         return self
 
-    def member_count(self, user_type="attendee", include_descendants=True):
-        count = 0
-        if user_type == "attendee":
-            count += self.attendeeprofile_set.count()
-        elif user_type == "leader":
-            count += self.leaderprofile_set.count()
-        # Add more user types as needed
+    def get_descendant_ids(self, include_self=True):
+        """
+        Return a lazy subquery of this faction's subtree ids.
+
+        Soft-deleted factions and everything below them are excluded.
+        """
+        return FactionClosure.objects.descendant_ids(self, include_self=include_self)
+
+    def get_ancestors(self):
+        """
+        Return the ancestor chain, root first.
+
+        Reads the chain cached by ``FactionQuerySet.with_ancestors()`` when
+        present; otherwise issues a single recursive query.
+        """
+        links = getattr(self, "prefetched_ancestor_links", None)
+        if links is None:
+            ancestors = Faction.objects.ancestors_of(self).select_related("organization")
+            return list(ancestors.order_by("depth"))
+        return [link.ancestor for link in links]
+
+    def get_root_faction(self):
+        """
+        Return the top of the live ancestor chain, or this faction.
+
+        Follows ``get_ancestors()``: below a soft-deleted ancestor the chain
+        ends there, so the stored ``root`` is only used when nothing between
+        is deleted.
+        """
+        if not self.root_id or self.root_id == self.pk:
+            return self
+        links = getattr(self, "prefetched_ancestor_links", None)
+        if links is not None:
+            return links[0].ancestor if links else self
+        ancestors = Faction.objects.ancestors_of(self).select_related("organization")
+        return ancestors.order_by("depth").first() or self
+
+    def member_counts(self, include_descendants=True):
+        """
+        Return the member count of every type from the persisted counters.
 
-        if include_descendants:
-            for child in self.children.all():
-                count += child.member_count(user_type, include_descendants)
-        return count
+        Returns:
+            dict: ``{"attendee": n, "leader": m, ...}`` for each entry in ``MEMBER_TYPES``;
+            a new type adds an entry there plus its pair of counter columns.
+        """
+        prefix = "subtree_" if include_descendants else ""
+        return {
+            member_type: getattr(self, f"{prefix}{member_type}_count", 0)
+            for member_type in self.MEMBER_TYPES
+        }
 
     def with_sub_faction_count(self):
         return Faction.objects.with_sub_faction_count()
@@ -95,3 +262,45 @@ class Faction(
                 fields=["organization", "slug"], name="unique_faction_slug_per_org"
             )
         ]
+
+
+@receiver(pre_delete, sender=Faction)
+def release_faction_member_counts(sender, instance, **kwargs):
+    """Take a hard-deleted faction's members off its ancestors' subtree counters."""
+    Faction.objects.release_member_counts(instance)
+
+
+@receiver(post_save, sender=Faction)
+@receiver(post_delete, sender=Faction)
+def bump_faction_tree_version(sender, instance, **kwargs):
+    """Invalidate process-local tree snapshots for the faction's organization."""
+    organization_id = instance.organization_id
+    transaction.on_commit(lambda: bump_version(TREE_VERSION, organization_id))
+
+    # Subtree contents change for the faction, its old parent chain and its new one.
+    loaded = getattr(instance, "_loaded_hierarchy", None)
+    bump_subtree_versions(instance.pk, instance.parent_id, loaded[0] if loaded else None)
+
+
+@receiver(post_save, sender=FactionEnrollment)
+@receiver(post_delete, sender=FactionEnrollment)
+def bump_faction_enrollment_version(sender, instance, **kwargs):
+    """Invalidate cached enrollment listings of the enrollment's faction."""
+    faction_id = instance.faction_id
+    if faction_id:
+        transaction.on_commit(lambda: bump_version(ENROLLMENT_VERSION, faction_id))
+
+
+@receiver(post_save, sender=AttendeeEnrollment)
+@receiver(post_delete, sender=AttendeeEnrollment)
+@receiver(post_save, sender=LeaderEnrollment)
+@receiver(post_delete, sender=LeaderEnrollment)
+def bump_member_enrollment_version(sender, instance, **kwargs):
+    """Invalidate enrollment-derived data of the faction a member enrolled through."""
+    faction_id = (
+        FactionEnrollment.objects.filter(pk=instance.faction_enrollment_id)
+        .values_list("faction_id", flat=True)
+        .first()
+    )
+    if faction_id:
+        transaction.on_commit(lambda: bump_version(ENROLLMENT_VERSION, faction_id))
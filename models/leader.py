@@ -2,11 +2,15 @@
 """ Leader Related Models. """
 
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from user.models import User, BaseUserProfile
 
+from faction.cache import MEMBER_USER_FIELDS, bump_subtree_versions
+from faction.models.faction import Faction
+from faction.querysets.profile import ProfileQuerySet
+
 
 class LeaderProfile(BaseUserProfile):
     class Meta:
@@ -28,9 +32,49 @@ class LeaderProfile(BaseUserProfile):
         "faction.Faction", on_delete=models.SET_NULL, null=True, blank=True
     )
 
+    objects = ProfileQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_faction_id = instance.__dict__.get("faction_id")
+        return instance
+
     def get_fallback_chain(self):
         return ["faction", "faction.organization"]
 
     def get_absolute_url(self):
         from django.urls import reverse
         return reverse("leaders:show", kwargs={"slug": self.slug})
+
+
+@receiver(post_save, sender=LeaderProfile)
+def track_leader_faction_counts(sender, instance, created, raw=False, **kwargs):
+    """Keep faction leader counters and cached member tables in step with the profile."""
+    if raw:
+        return
+    if created:
+        old_faction_id = None
+    else:
+        old_faction_id = getattr(instance, "_loaded_faction_id", instance.faction_id)
+    if old_faction_id != instance.faction_id:
+        Faction.objects.move_member(old_faction_id, instance.faction_id, "leader")
+    # Any profile edit may change what cached member tables show.
+    bump_subtree_versions(old_faction_id, instance.faction_id)
+    instance._loaded_faction_id = instance.faction_id
+
+
+@receiver(post_delete, sender=LeaderProfile)
+def release_leader_faction_counts(sender, instance, **kwargs):
+    Faction.objects.adjust_member_count(instance.faction_id, "leader", -1)
+    bump_subtree_versions(instance.faction_id)
+
+
+@receiver(post_save, sender=User)
+def bump_leader_user_versions(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Invalidate cached member tables of the user's leader factions when shown fields change."""
+    if raw or (update_fields is not None and not MEMBER_USER_FIELDS & set(update_fields)):
+        return
+    bump_subtree_versions(
+        *LeaderProfile.objects.filter(user=instance).values_list("faction_id", flat=True)
+    )
@@ -0,0 +1,189 @@
+# faction/pagination.py
+"""
+Keyset (cursor) pagination for member listings.
+
+Pages are addressed by the ``(sort key, id)`` of the row they continue from
+instead of an ``OFFSET``, so every page costs one indexed range scan of
+``per_page + 1`` rows and no ``COUNT(*)``.
+"""
+
+import base64
+import binascii
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.pagination import CursorPagination
+
+
+def encode_cursor(position):
+    payload = json.dumps(position, cls=DjangoJSONEncoder, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Return the position encoded in ``token``, or ``None`` when it is missing or malformed."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        return None
+    return position if isinstance(position, dict) else None
+
+
+def _row_value(row, field):
+    if isinstance(row, dict):
+        return row[field]
+    value = row
+    for part in field.split("__"):
+        value = getattr(value, part)
+    return value
+
+
+class KeysetPage:
+    """One page of rows plus the cursors of its neighbours."""
+
+    def __init__(self, rows, next_cursor=None, previous_cursor=None):
+        self.rows = rows
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class KeysetPaginator:
+    """
+    Paginate on ``(sort_field, *id_fields)``.
+
+    ``sort_field`` should be non-null; ``id_field`` breaks ties so the order is
+    total and cursors stay stable while rows are added or removed. It may be a
+    tuple of fields when no single column is unique, e.g. rows unioned from
+    several tables.
+    """
+
+    def __init__(self, sort_field, id_field="pk", per_page=25, descending=False):
+        self.sort_field = sort_field
+        self.id_fields = (id_field,) if isinstance(id_field, str) else tuple(id_field)
+        self.per_page = per_page
+        self.descending = descending
+
+    def page(self, source, cursor=None):
+        """
+        Return the page after (or before) ``cursor``.
+
+        ``source`` is a queryset, or a callable taking the keyset ``Q`` (or
+        ``None``) and returning one, for querysets such as unions that must be
+        filtered before they are combined.
+        """
+        queryset, position = self._page_queryset(source, cursor)
+        return self._build_page(list(queryset), position)
+
+    async def apage(self, source, cursor=None):
+        """Async version of ``page()``, reading the rows with ``async for``."""
+        queryset, position = self._page_queryset(source, cursor)
+        return self._build_page([row async for row in queryset], position)
+
+    def _page_queryset(self, source, cursor):
+        position = self._position(cursor)
+        backwards = bool(position and position.get("before"))
+        condition = self._condition(position, backwards) if position else None
+
+        if callable(source):
+            queryset = source(condition)
+        else:
+            queryset = source.filter(condition) if condition is not None else source
+
+        descending = self.descending != backwards
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(
+            *(f"{prefix}{field}" for field in (self.sort_field, *self.id_fields))
+        )
+        return queryset[: self.per_page + 1], position
+
+    def _build_page(self, rows, position):
+        backwards = bool(position and position.get("before"))
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+
+        if not rows:
+            return KeysetPage(rows)
+        next_cursor = previous_cursor = None
+        if has_more or backwards:
+            next_cursor = self._cursor(rows[-1])
+        if (has_more and backwards) or (position and not backwards):
+            previous_cursor = self._cursor(rows[0], before=True)
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+    def _position(self, cursor):
+        position = decode_cursor(cursor)
+        if not position or "key" not in position or "id" not in position:
+            return None
+        # Cursors minted under another ordering would skip or repeat rows.
+        if position.get("sort") != self.sort_field or position.get("desc") != self.descending:
+            return None
+        if not isinstance(position["id"], list) or len(position["id"]) != len(self.id_fields):
+            return None
+        return position
+
+    def _cursor(self, row, before=False):
+        position = {
+            "sort": self.sort_field,
+            "desc": self.descending,
+            "key": _row_value(row, self.sort_field),
+            "id": [_row_value(row, field) for field in self.id_fields],
+        }
+        if before:
+            position["before"] = True
+        return encode_cursor(position)
+
+    def _condition(self, position, backwards):
+        # (a, b, c) > (x, y, z) spelled out as a > x OR (a = x AND b > y) OR ...
+        lookup = "lt" if self.descending != backwards else "gt"
+        fields = (self.sort_field, *self.id_fields)
+        values = (position["key"], *position["id"])
+        condition, equal = Q(), {}
+        for field, value in zip(fields, values):
+            condition |= Q(**equal, **{f"{field}__{lookup}": value})
+            equal[field] = value
+        return condition
+
+
+class MemberCursorPagination(CursorPagination):
+    """
+    Cursor pagination for profile APIs.
+
+    Profiles are ordered by their user's username, annotated onto each row
+    as ``user_username`` because the cursor position is read from the
+    instance's first ordering attribute. One user can hold profiles in
+    several factions, so usernames repeat; DRF's cursor offset steps over
+    such ties. Searched querysets are paged best match first.
+    """
+
+    ordering = ("user_username", "pk")
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if "search_rank" not in queryset.query.annotations:
+            queryset = queryset.annotate(user_username=F("user__username"))
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        if "search_rank" in queryset.query.annotations:
+            return ("-search_rank", "pk")
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,47 @@
+# faction/permissions.py
+""" Faction API Permissions. """
+
+from rest_framework.permissions import BasePermission
+
+from .models.closure import FactionClosure
+from .models.faction import Faction
+from .models.leader import LeaderProfile
+
+
+def leads_faction(user, target, admin=False):
+    """
+    Return whether ``user`` leads ``target``, a faction or an organization.
+
+    A leader of a faction leads its whole subtree; with ``admin``, only
+    leader admins count. An organization is led by its admin leaders.
+    Superusers lead everything.
+    """
+    if not user.is_authenticated:
+        return False
+    if user.is_superuser:
+        return True
+    profiles = LeaderProfile.objects.filter(user=user)
+    if admin:
+        profiles = profiles.filter(is_admin=True)
+    if isinstance(target, Faction):
+        profiles = profiles.filter(
+            faction_id__in=FactionClosure.objects.ancestor_ids(target, include_self=True)
+        )
+    else:
+        profiles = profiles.filter(organization=target, is_admin=True)
+    return profiles.exists()
+
+
+class LeadsFaction(BasePermission):
+    """Object permission for leaders of the faction (or of one of its ancestors)."""
+
+    admin = False
+
+    def has_object_permission(self, request, view, obj):
+        return leads_faction(request.user, obj, admin=self.admin)
+
+
+class AdministersFaction(LeadsFaction):
+    """Object permission for leader admins of the faction or organization."""
+
+    admin = True
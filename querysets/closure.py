@@ -0,0 +1,26 @@
+# faction/querysets/closure.py
+
+from django.db import models
+
+
+class FactionClosureQuerySet(models.QuerySet):
+    def descendant_ids(self, faction, include_self=True):
+        """
+        Return a lazy ``descendant_id`` subquery for the subtree rooted at ``faction``.
+
+        The result is meant to be used as ``faction_id__in=...`` so the subtree
+        resolves inside the outer query instead of as a Python list.
+        """
+        queryset = self.filter(ancestor_id=getattr(faction, "pk", faction))
+        if not include_self:
+            queryset = queryset.filter(depth__gt=0)
+        return queryset.values("descendant_id")
+
+    def ancestor_ids(self, faction, include_self=False):
+        """
+        Return a lazy ``ancestor_id`` subquery for the chain above ``faction``.
+        """
+        queryset = self.filter(descendant_id=getattr(faction, "pk", faction))
+        if not include_self:
+            queryset = queryset.filter(depth__gt=0)
+        return queryset.values("ancestor_id")
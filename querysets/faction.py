@@ -1,7 +1,12 @@
 """ Faction Related QuerySets."""
 
-from django.db import models
-from django.db.models import Q
+from django.apps import apps
+from django.db import connections, models
+from django.db.models import Exists, F, Func, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+from django.db.models.lookups import StartsWith
+from django.db.models.expressions import RawSQL
+
 
 class FactionQuerySet(models.QuerySet):
     def active(self):
@@ -18,18 +23,136 @@ class FactionQuerySet(models.QuerySet):
 
     def with_member_count(self, include_descendants=True):
         if include_descendants:
-            return self.annotate(
-                member_count=models.Count('attendeeprofile', distinct=True)
+            return self.with_subtree_member_counts().annotate(
+                member_count=models.F("total_attendee_count")
             )
         return self.annotate(
             member_count=models.Count('attendeeprofile', distinct=True)
         )
 
+    def with_subtree_member_counts(self):
+        """
+        Annotate ``total_<type>_count`` (e.g. ``total_attendee_count``) for each subtree.
+
+        Each count is a subquery joining the profiles to the closure table, so
+        the whole list is fetched in one statement however deep the trees are.
+        """
+        return self.with_member_counts(include_descendants=True, prefix="total_")
+
+    def with_member_counts(self, include_descendants=True, prefix="total_"):
+        """
+        Annotate ``<prefix><type>_count`` for every type in ``Faction.MEMBER_TYPES``.
+        """
+        return self.annotate(
+            **{
+                f"{prefix}{member_type}_count": self._member_count(label, include_descendants)
+                for member_type, label in self.model.MEMBER_TYPES.items()
+            }
+        )
+
+    def _member_count(self, label, include_descendants=True):
+        profile_model = apps.get_model(label)
+        if include_descendants:
+            members = profile_model.objects.filter(
+                faction__ancestor_links__ancestor_id=OuterRef("pk")
+            )
+        else:
+            members = profile_model.objects.filter(faction_id=OuterRef("pk"))
+        members = members.order_by().annotate(total=Func(F("pk"), function="COUNT")).values("total")
+        return Coalesce(Subquery(members, output_field=models.IntegerField()), 0)
+
     def include_descendant_organizations(self):
         org_ids = set()
         for faction in self:
             org_ids.update(faction.organization.get_descendant_ids())
         return self.filter(organization__id__in=org_ids)
 
+    def descendants_of(self, faction, include_self=True):
+        """
+        Filter to the subtree rooted at ``faction`` using one ``WITH RECURSIVE`` query.
+
+        The recursion stops at soft-deleted factions. The result stays lazy, so
+        it can be passed to ``faction__in=`` as a subquery.
+        """
+        sql = (
+            "WITH RECURSIVE subtree(id) AS ("
+            "SELECT id FROM {table} WHERE id = %s "
+            "UNION ALL "
+            "SELECT child.id FROM {table} child "
+            "INNER JOIN subtree ON child.parent_id = subtree.id "
+            "WHERE child.is_deleted = %s"
+            ") SELECT id FROM subtree"
+        )
+        queryset = self.filter(pk__in=self._recursive_ids(sql, [faction.pk, False]))
+        if not include_self:
+            queryset = queryset.exclude(pk=faction.pk)
+        return queryset
+
+    def ancestors_of(self, faction):
+        """
+        Filter to the ancestors of ``faction`` using one ``WITH RECURSIVE`` query.
+
+        Like the closure table, the chain stops at soft-deleted factions: a
+        deleted faction, or one below a deleted ancestor, has no ancestors.
+        """
+        sql = (
+            "WITH RECURSIVE chain(id, parent_id) AS ("
+            "SELECT id, parent_id FROM {table} WHERE id = %s AND is_deleted = %s "
+            "UNION ALL "
+            "SELECT parent.id, parent.parent_id FROM {table} parent "
+            "INNER JOIN chain ON parent.id = chain.parent_id "
+            "WHERE parent.is_deleted = %s"
+            ") SELECT id FROM chain WHERE id <> %s"
+        )
+        return self.filter(
+            pk__in=self._recursive_ids(sql, [faction.pk, False, False, faction.pk])
+        )
+
+    def with_ancestors(self):
+        """
+        Load every row's ancestor chain with one extra query.
+
+        The chain is cached on each faction and read by ``get_ancestors()``,
+        ``get_root_faction()`` and breadcrumb rendering. Organizations and the
+        direct parent are joined in so ``__str__`` and ``parent`` need no query.
+        Soft-deleted factions follow the same rule as ``ancestors_of()``.
+        """
+        from ..models.closure import FactionClosure
+
+        return self.select_related("organization", "parent__organization").prefetch_related(
+            models.Prefetch(
+                "ancestor_links",
+                # Soft-deletes detach subtrees from the closure; the deleted
+                # ancestor itself keeps its links and is filtered out here.
+                queryset=FactionClosure.objects.filter(depth__gt=0, ancestor__is_deleted=False)
+                .select_related("ancestor__organization")
+                .order_by("-depth"),
+                to_attr="prefetched_ancestor_links",
+            )
+        )
+
+    def within(self, faction, include_self=True):
+        """
+        Filter to the subtree of ``faction`` with an indexed prefix match on ``path``.
+
+        Follows the same rule as ``descendants_of()``: soft-deleted factions
+        below ``faction``, and everything under them, are left out.
+        """
+        separator = self.model.PATH_SEPARATOR
+        prefix = f"{faction.path}{separator}"
+        severed = self.model.objects.filter(
+            StartsWith(OuterRef("path"), Concat(F("path"), Value(separator))),
+            path__startswith=prefix,
+            is_deleted=True,
+        )
+        condition = Q(path__startswith=prefix, is_deleted=False) & ~Exists(severed)
+        if include_self:
+            condition |= Q(pk=faction.pk)
+        return self.filter(condition)
+
+    def _recursive_ids(self, sql, params):
+        table = connections[self.db].ops.quote_name(self.model._meta.db_table)
+        return RawSQL(sql.format(table=table), params)
+
     def with_sub_faction_count(self):
         return self.annotate(sub_faction_count=models.Count('children', distinct=True))
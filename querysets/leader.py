@@ -8,8 +8,9 @@ class LeaderQuerySet(models.QuerySet):
         return self.filter(user_type='leader')
 
     def by_faction(self, faction):
-        all_factions = [faction] + faction.get_all_children()
-        return self.filter(leaderprofile__faction__in=all_factions)
+        from ..models.faction import Faction
+
+        return self.filter(leaderprofile__faction__in=Faction.objects.descendants_of(faction))
 
     def by_organization(self, organization):
         all_organizations = [organization] + organization.get_all_children()
@@ -0,0 +1,12 @@
+# faction/querysets/profile.py
+
+from django.db import models
+
+from .search import MemberSearchQuerySetMixin
+from .subtree import SubtreeQuerySetMixin
+
+
+class ProfileQuerySet(SubtreeQuerySetMixin, MemberSearchQuerySetMixin, models.QuerySet):
+    """
+    Queryset for attendee and leader profiles: subtree scoping and member search.
+    """
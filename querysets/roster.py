@@ -0,0 +1,58 @@
+# faction/querysets/roster.py
+
+from django.db import models
+from django.db.models import F, Value
+
+ROSTER_COLUMNS = (
+    "member_id",
+    "member_slug",
+    "member_type",
+    "username",
+    "first_name",
+    "last_name",
+    "email",
+    "user_type",
+    "faction_name",
+)
+
+
+def roster_queryset(faction, condition=None, query=None):
+    """
+    Return the leaders and attendees of a faction subtree as one ``UNION ALL``.
+
+    Both sides select the same annotated columns, so ordering and ``LIMIT``
+    run in SQL and only one page of dict rows is ever loaded. ``condition`` is
+    a ``Q`` over those columns applied to each side before the union, since a
+    combined queryset cannot be filtered afterwards. ``query`` runs the ranked
+    member search on both sides and adds a ``search_rank`` column.
+    """
+    from ..models.attendee import AttendeeProfile
+    from ..models.leader import LeaderProfile
+
+    query = (query or "").strip()
+    columns = (*ROSTER_COLUMNS, "search_rank") if query else ROSTER_COLUMNS
+
+    def members(profile_model, member_type):
+        queryset = (
+            profile_model.objects.in_subtree(faction)
+            .search_members(query)
+            .order_by()
+            .annotate(
+                member_id=F("id"),
+                member_slug=F("slug"),
+                member_type=Value(member_type, output_field=models.CharField()),
+                username=F("user__username"),
+                first_name=F("user__first_name"),
+                last_name=F("user__last_name"),
+                email=F("user__email"),
+                user_type=F("user__user_type"),
+                faction_name=F("faction__name"),
+            )
+        )
+        if condition is not None:
+            queryset = queryset.filter(condition)
+        return queryset.values(*columns)
+
+    return members(LeaderProfile, "leader").union(
+        members(AttendeeProfile, "attendee"), all=True
+    )
@@ -0,0 +1,77 @@
+# faction/querysets/search.py
+
+from django.db import connections, models
+from django.db.models import Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+
+# FTS5 copy of the searchable user columns, created by migration 0024 on SQLite
+# and kept in sync by ``faction.search_index``.
+MEMBER_SEARCH_TABLE = "faction_member_search"
+MEMBER_SEARCH_FIELDS = ("username", "first_name", "last_name", "email")
+
+
+def fts_match_expression(query):
+    """Turn free text into an FTS5 query: every term must match as a prefix."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+class MemberSearchQuerySetMixin:
+    """
+    Ranked member search for querysets of models with a ``user`` foreign key.
+    """
+
+    user_field = "user"
+
+    def search_members(self, query):
+        """
+        Filter to members whose username, name or email matches ``query``.
+
+        Annotates ``search_rank`` (higher is better). Postgres matches through
+        the trigram GIN indexes and ranks by trigram similarity; SQLite goes
+        through the FTS5 table and ranks by bm25. A blank query is a no-op.
+        """
+        query = (query or "").strip()
+        if not query:
+            return self
+        vendor = connections[self.db].vendor
+        if vendor == "postgresql":
+            return self._search_trigram(query)
+        if vendor == "sqlite":
+            return self._search_fts(query)
+        return self.filter(self._contains(query)).annotate(
+            search_rank=Value(0.0, output_field=models.FloatField())
+        )
+
+    def _contains(self, query):
+        matches = Q()
+        for field in MEMBER_SEARCH_FIELDS:
+            matches |= Q(**{f"{self.user_field}__{field}__icontains": query})
+        return matches
+
+    def _search_trigram(self, query):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        # UPPER(col) LIKE UPPER(%q%) is served by the gin_trgm_ops expression indexes.
+        rank = Greatest(
+            *(TrigramSimilarity(f"{self.user_field}__{field}", query) for field in MEMBER_SEARCH_FIELDS)
+        )
+        return self.filter(self._contains(query)).annotate(search_rank=rank)
+
+    def _search_fts(self, query):
+        match = fts_match_expression(query)
+        ops = connections[self.db].ops
+        table = ops.quote_name(MEMBER_SEARCH_TABLE)
+        user_column = "{}.{}".format(
+            ops.quote_name(self.model._meta.db_table),
+            ops.quote_name(self.model._meta.get_field(self.user_field).column),
+        )
+        matching = RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", (match,))
+        # bm25 rank is negative with lower being better; flip it so higher ranks first.
+        rank = RawSQL(
+            f"SELECT -rank FROM {table} WHERE {table} MATCH %s AND rowid = {user_column}",
+            (match,),
+            output_field=models.FloatField(),
+        )
+        return self.filter(**{f"{self.user_field}_id__in": matching}).annotate(search_rank=rank)
@@ -0,0 +1,22 @@
+# faction/querysets/subtree.py
+
+
+class SubtreeQuerySetMixin:
+    """
+    Shared subtree filtering for querysets of models with a ``faction`` foreign key.
+    """
+
+    faction_field = "faction"
+
+    def in_subtree(self, faction, include_self=True):
+        """
+        Filter to rows whose faction lies in the subtree rooted at ``faction``.
+
+        Emits ``faction_id IN (SELECT descendant_id FROM closure WHERE ancestor_id = %s)``,
+        so the SQL has the same size for any subtree and the database can
+        drive the lookup through the ``faction_id`` index.
+        """
+        from ..models.closure import FactionClosure
+
+        descendants = FactionClosure.objects.descendant_ids(faction, include_self=include_self)
+        return self.filter(**{f"{self.faction_field}_id__in": descendants})
@@ -0,0 +1,82 @@
+# faction/search_index.py
+"""
+Keep the SQLite member search table in step with the user table.
+
+Migration 0024 creates ``faction_member_search`` as an FTS5 table holding its
+own copy of the searchable user columns. The receivers below update one row
+per saved or deleted user, and ``rebuild_member_search_index`` refills the
+table for changes made without signals (``queryset.update()``, raw SQL).
+Postgres searches the user table through trigram indexes and needs none of this.
+"""
+
+from django.conf import settings
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .querysets.search import MEMBER_SEARCH_FIELDS, MEMBER_SEARCH_TABLE
+
+
+def _search_connection(using):
+    connection = connections[using]
+    return connection if connection.vendor == "sqlite" else None
+
+
+def index_member(user, using="default"):
+    """Replace the search row of ``user``."""
+    connection = _search_connection(using)
+    if connection is None:
+        return
+    table = connection.ops.quote_name(MEMBER_SEARCH_TABLE)
+    columns = ", ".join(MEMBER_SEARCH_FIELDS)
+    placeholders = ", ".join(["%s"] * len(MEMBER_SEARCH_FIELDS))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE rowid = %s", [user.pk])
+        cursor.execute(
+            f"INSERT INTO {table}(rowid, {columns}) VALUES (%s, {placeholders})",
+            [user.pk, *(getattr(user, field) or "" for field in MEMBER_SEARCH_FIELDS)],
+        )
+
+
+def unindex_member(user_id, using="default"):
+    """Drop the search row of the user with ``user_id``."""
+    connection = _search_connection(using)
+    if connection is None:
+        return
+    table = connection.ops.quote_name(MEMBER_SEARCH_TABLE)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE rowid = %s", [user_id])
+
+
+def rebuild_member_search_index(user_table, using="default"):
+    """
+    Refill the search table from ``user_table`` with two statements.
+
+    Returns:
+        bool: ``False`` when the database has no search table to rebuild.
+    """
+    connection = _search_connection(using)
+    if connection is None:
+        return False
+    quote = connection.ops.quote_name
+    table = quote(MEMBER_SEARCH_TABLE)
+    columns = ", ".join(MEMBER_SEARCH_FIELDS)
+    values = ", ".join(f"COALESCE({quote(field)}, '')" for field in MEMBER_SEARCH_FIELDS)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(
+            f"INSERT INTO {table}(rowid, {columns}) SELECT id, {values} FROM {quote(user_table)}"
+        )
+    return True
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def index_saved_member(sender, instance, using="default", update_fields=None, **kwargs):
+    if update_fields is not None and not set(MEMBER_SEARCH_FIELDS) & set(update_fields):
+        return
+    index_member(instance, using)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def unindex_deleted_member(sender, instance, using="default", **kwargs):
+    unindex_member(instance.pk, using)
@@ -1,11 +1,11 @@
 # faction/tables/attendee.py
 import django_tables2 as tables
-from django.urls import reverse
 from core.mixins.tables import ActionsColumnMixin, ActionUrlMixin
+from .mixins import CachedReverseMixin
 from ..models.attendee import AttendeeProfile
 
 
-class AttendeeTable(ActionsColumnMixin, ActionUrlMixin, tables.Table):
+class AttendeeTable(CachedReverseMixin, ActionsColumnMixin, ActionUrlMixin, tables.Table):
     username = tables.Column(accessor="user__username", verbose_name="Username")
     first_name = tables.Column(accessor="user__first_name", verbose_name="First Name")
     last_name = tables.Column(accessor="user__last_name", verbose_name="Last Name")
@@ -52,21 +52,23 @@ class AttendeeTable(ActionsColumnMixin, ActionUrlMixin, tables.Table):
 
         if action == "add":
             if faction_slug:
-                return reverse("factions:attendees:new", kwargs={"faction_slug": faction_slug})
+                return self.reverse_url(
+                    "factions:attendees:new", kwargs={"faction_slug": faction_slug}
+                )
             return None
 
         if action == "show":
-            return reverse(
+            return self.reverse_url(
                 "factions:attendees:show",
                 kwargs={"faction_slug": faction_slug, "slug": record.slug},
             )
         if action == "edit":
-            return reverse(
+            return self.reverse_url(
                 "factions:attendees:edit",
                 kwargs={"faction_slug": faction_slug, "slug": record.slug},
             )
         if action == "delete":
-            return reverse(
+            return self.reverse_url(
                 "factions:attendees:delete",
                 kwargs={"faction_slug": faction_slug, "slug": record.slug},
             )
@@ -6,6 +6,9 @@ from ..models.faction import Faction
 
 
 class FactionTable(ActionsColumnMixin, tables.Table):
+    # Expects FactionQuerySet.with_subtree_member_counts()
+    member_count = tables.Column(accessor="total_attendee_count", verbose_name="Members")
+
     class Meta:
         model = Faction
         template_name = "django_tables2/bootstrap4.html"
@@ -27,6 +30,8 @@ class FactionTable(ActionsColumnMixin, tables.Table):
 
 class ChildFactionTable(ActionsColumnMixin, tables.Table):
     debug_mode = False
+    # Expects FactionQuerySet.with_subtree_member_counts()
+    member_count = tables.Column(accessor="total_attendee_count", verbose_name="Members")
 
     class Meta:
         model = Faction
@@ -51,9 +56,11 @@ class ChildFactionTable(ActionsColumnMixin, tables.Table):
 
 class FactionOverviewTable(tables.Table):
     name = tables.Column(verbose_name="Faction Name")
-    #leaders_count = tables.Column(verbose_name="Number of Leaders", accessor="leaders.count")
-    #members_count = tables.Column(verbose_name="Number of Attendees", accessor="attendees.count")
+    leaders_count = tables.Column(verbose_name="Number of Leaders", accessor="total_leader_count")
+    members_count = tables.Column(
+        verbose_name="Number of Attendees", accessor="total_attendee_count"
+    )
 
     class Meta:
         model = Faction
-        fields = ["name"]#, "leaders_count", "members_count"]
+        fields = ["name", "leaders_count", "members_count"]
@@ -1,11 +1,11 @@
 # faction/tables/leader.py
 import django_tables2 as tables
-from django.urls import reverse
 from core.mixins.tables import ActionsColumnMixin, ActionUrlMixin
+from .mixins import CachedReverseMixin
 from ..models.leader import LeaderProfile
 
 
-class LeaderTable(ActionsColumnMixin, ActionUrlMixin, tables.Table):
+class LeaderTable(CachedReverseMixin, ActionsColumnMixin, ActionUrlMixin, tables.Table):
     username = tables.Column(accessor="user__username", verbose_name="Username")
     first_name = tables.Column(accessor="user__first_name", verbose_name="First Name")
     last_name = tables.Column(accessor="user__last_name", verbose_name="Last Name")
@@ -54,21 +54,23 @@ class LeaderTable(ActionsColumnMixin, ActionUrlMixin, tables.Table):
         )
         if action == "add":
             if faction_slug:
-                return reverse("factions:leaders:new", kwargs={"faction_slug": faction_slug})
+                return self.reverse_url(
+                    "factions:leaders:new", kwargs={"faction_slug": faction_slug}
+                )
             return None
 
         if action == "show":
-            return reverse(
+            return self.reverse_url(
                 "factions:leaders:show",
                 kwargs={"faction_slug": faction_slug, "slug": record.slug},
             )
         if action == "edit":
-            return reverse(
+            return self.reverse_url(
                 "factions:leaders:edit",
                 kwargs={"faction_slug": faction_slug, "slug": record.slug},
             )
         if action == "delete":
-            return reverse(
+            return self.reverse_url(
                 "factions:leaders:delete",
                 kwargs={"faction_slug": faction_slug, "slug": record.slug},
             )
@@ -0,0 +1,44 @@
+# faction/tables/mixins.py
+import re
+
+from django.urls import NoReverseMatch, reverse
+
+# Values made only of these characters come out of reverse() unquoted, so they
+# can be pasted into a reversed template as-is. "__" is excluded because it
+# delimits the placeholders.
+_SUBSTITUTABLE = re.compile(r"(?!.*__)[-a-zA-Z0-9_]+")
+
+
+def _placeholder(name):
+    return f"__{name}__"
+
+
+class CachedReverseMixin:
+    """
+    Reverse each action route once per table instance and fill in kwargs per row.
+
+    The first call for a route reverses it with placeholder kwargs; later rows
+    substitute their values into that template instead of walking the resolver.
+    Values the template cannot reproduce byte for byte (anything ``reverse()``
+    would quote, or a route whose converters reject the placeholder) fall back
+    to ``reverse()``.
+    """
+
+    def reverse_url(self, viewname, kwargs):
+        templates = self.__dict__.setdefault("_url_templates", {})
+        key = (viewname, tuple(sorted(kwargs)))
+        if key not in templates:
+            try:
+                templates[key] = reverse(
+                    viewname, kwargs={name: _placeholder(name) for name in key[1]}
+                )
+            except NoReverseMatch:
+                templates[key] = None
+
+        template = templates[key]
+        values = {name: str(value) for name, value in kwargs.items()}
+        if template is None or not all(_SUBSTITUTABLE.fullmatch(v) for v in values.values()):
+            return reverse(viewname, kwargs=kwargs)
+        for name, value in values.items():
+            template = template.replace(_placeholder(name), value)
+        return template
@@ -1,19 +1,22 @@
 # faction/tables/roster.py
 import django_tables2 as tables
-from django.urls import reverse
 
 from core.mixins.tables import ActionsColumnMixin, ActionUrlMixin
+from .mixins import CachedReverseMixin
 from faction.models.leader import LeaderProfile
-from faction.models.attendee import AttendeeProfile
 
 
-class RosterTable(ActionsColumnMixin, ActionUrlMixin, tables.Table):
-    username = tables.Column(accessor="user.username", verbose_name="Username")
-    first_name = tables.Column(accessor="user.first_name", verbose_name="First Name")
-    last_name = tables.Column(accessor="user.last_name", verbose_name="Last Name")
-    email = tables.Column(accessor="user.email", verbose_name="Email")
-    user_type = tables.Column(accessor="user.user_type", verbose_name="User Type")
-    faction = tables.Column(accessor="faction.name", verbose_name="Faction")
+class RosterTable(CachedReverseMixin, ActionsColumnMixin, ActionUrlMixin, tables.Table):
+    """
+    Unified leader/attendee roster over the dict rows of ``roster_queryset``.
+    """
+
+    username = tables.Column(accessor="username", verbose_name="Username")
+    first_name = tables.Column(accessor="first_name", verbose_name="First Name")
+    last_name = tables.Column(accessor="last_name", verbose_name="Last Name")
+    email = tables.Column(accessor="email", verbose_name="Email")
+    user_type = tables.Column(accessor="user_type", verbose_name="User Type")
+    faction = tables.Column(accessor="faction_name", verbose_name="Faction")
 
     class Meta:
         model = LeaderProfile
@@ -26,6 +29,7 @@ class RosterTable(ActionsColumnMixin, ActionUrlMixin, tables.Table):
             "user_type",
             "faction",
         )
+        order_by = ("username", "member_id")
         attrs = {"class": "table table-striped table-bordered"}
 
     url_namespace = None  # handled manually below
@@ -35,17 +39,14 @@ class RosterTable(ActionsColumnMixin, ActionUrlMixin, tables.Table):
         """Route actions based on profile type."""
         if not record:
             return None
-        if isinstance(record, LeaderProfile):
-            ns = "leaders"
-        elif isinstance(record, AttendeeProfile):
-            ns = "attendees"
-        else:
+        ns = {"leader": "leaders", "attendee": "attendees"}.get(record.get("member_type"))
+        if ns is None:
             return None
 
         if action == "show":
-            return reverse(f"{ns}:show", kwargs={"slug": record.slug})
+            return self.reverse_url(f"{ns}:show", kwargs={"slug": record["member_slug"]})
         if action == "edit":
-            return reverse(f"{ns}:edit", kwargs={"slug": record.slug})
+            return self.reverse_url(f"{ns}:edit", kwargs={"slug": record["member_slug"]})
         if action == "delete":
-            return reverse(f"{ns}:delete", kwargs={"slug": record.slug})
+            return self.reverse_url(f"{ns}:delete", kwargs={"slug": record["member_slug"]})
         return None
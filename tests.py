@@ -1,14 +1,58 @@
 # faction/tests.py
 
-from django.test import RequestFactory, TestCase
+import threading
+import time
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.http import Http404
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from django.urls import reverse
 
 from core.tests import BaseDomainTestCase, mute_profile_signals
 from core.utils import is_leader_admin
+from faction.cache import (
+    ENROLLMENT_VERSION,
+    SUBTREE_VERSION,
+    TREE_VERSION,
+    CachedWidgetData,
+    bump_declared_model_version,
+    bump_version,
+    get_versions,
+    model_version_namespace,
+    version_key,
+)
+from faction.exporters import iter_roster_csv
+from faction.importers import FactionTreeImporter
+from faction.pagination import KeysetPaginator
+from faction.permissions import leads_faction
+from faction.querysets.roster import roster_queryset
 from user.models import User
+from faction.models.attendee import AttendeeProfile
+from faction.models.faction import Faction
 from faction.models.leader import LeaderProfile
-from faction.views.faction import ManageView as FactionManageView
+from faction.views.asynchronous import AsyncAttendeeIndexView
+from faction.views.attendee import IndexView as AttendeeIndexView
+from faction.views.faction import (
+    FactionViewSet,
+    ManagePanelView,
+    ManageView as FactionManageView,
+    RosterView,
+)
+from faction.views.leader import LeaderViewSet
+from faction.views.mixins import ConcurrentWidgetMixin, get_widget_executor
+from faction.forms.faction import FactionForm
 from faction.forms.leader import LeaderForm
 from faction.serializers import LeaderSerializer
+from faction.tables.attendee import AttendeeTable
+from faction.tree import get_faction_tree
 
 
 class LeaderAdminPermissionTests(BaseDomainTestCase):
@@ -105,3 +149,803 @@ class LeaderFormAndSerializerTests(BaseDomainTestCase):
         data = LeaderSerializer(self.profile).data
         self.assertIn("is_admin", data)
         self.assertTrue(data["is_admin"])
+
+
+class FactionHierarchyTests(BaseDomainTestCase):
+    def setUp(self):
+        super().setUp()
+        self.district = Faction.objects.create(
+            name="District", organization=self.organization, parent=self.faction
+        )
+        self.troop = Faction.objects.create(
+            name="Troop", organization=self.organization, parent=self.district
+        )
+
+    def subtree(self, faction):
+        return set(
+            Faction.objects.filter(id__in=faction.get_descendant_ids()).values_list(
+                "id", flat=True
+            )
+        )
+
+    def test_closure_tracks_created_factions(self):
+        self.assertEqual(
+            self.subtree(self.faction), {self.faction.id, self.district.id, self.troop.id}
+        )
+        self.assertEqual(self.subtree(self.troop), {self.troop.id})
+
+    def test_closure_follows_reparent_and_soft_delete(self):
+        self.troop.parent = self.faction
+        self.troop.save()
+        self.assertEqual(self.subtree(self.district), {self.district.id})
+        self.assertIn(self.troop.id, self.subtree(self.faction))
+
+        self.troop.is_deleted = True
+        self.troop.save()
+        self.assertNotIn(self.troop.id, self.subtree(self.faction))
+
+    def test_recursive_descendants_and_ancestors(self):
+        self.assertEqual(
+            set(Faction.objects.descendants_of(self.faction).values_list("id", flat=True)),
+            {self.faction.id, self.district.id, self.troop.id},
+        )
+        self.assertEqual(
+            set(
+                Faction.objects.descendants_of(self.faction, include_self=False).values_list(
+                    "id", flat=True
+                )
+            ),
+            {self.district.id, self.troop.id},
+        )
+        self.assertEqual(
+            set(Faction.objects.ancestors_of(self.troop).values_list("id", flat=True)),
+            {self.faction.id, self.district.id},
+        )
+
+    def test_tree_position_columns_follow_moves(self):
+        self.faction.refresh_from_db()
+        self.assertEqual(self.troop.depth, self.faction.depth + 2)
+        self.assertEqual(self.troop.get_root_faction(), self.faction.get_root_faction())
+        self.assertTrue(self.troop.path.startswith(self.district.path + Faction.PATH_SEPARATOR))
+
+        self.district.parent = None
+        self.district.save()
+        self.troop.refresh_from_db()
+        self.assertEqual(self.troop.depth, 1)
+        self.assertEqual(self.troop.root_id, self.district.id)
+        self.assertEqual(
+            set(Faction.objects.within(self.district).values_list("id", flat=True)),
+            {self.district.id, self.troop.id},
+        )
+
+    def test_path_apis_stop_at_soft_deleted_factions(self):
+        self.district.is_deleted = True
+        self.district.save()
+        self.troop.refresh_from_db()
+        self.assertEqual(
+            set(Faction.objects.within(self.faction).values_list("id", flat=True)),
+            {self.faction.id},
+        )
+        self.assertEqual(
+            set(Faction.objects.within(self.district).values_list("id", flat=True)),
+            set(Faction.objects.descendants_of(self.district).values_list("id", flat=True)),
+        )
+        self.assertEqual(self.troop.get_root_faction(), self.troop)
+        self.assertEqual(
+            Faction.objects.with_ancestors().get(pk=self.troop.pk).get_root_faction(), self.troop
+        )
+
+    def test_move_to_rejects_cycles(self):
+        with self.assertRaises(ValidationError):
+            self.district.move_to(self.troop)
+        with self.assertRaises(ValidationError):
+            self.district.move_to(self.district)
+
+    def test_move_to_rewrites_subtree(self):
+        self.district.move_to(None)
+        self.troop.refresh_from_db()
+        self.assertEqual(self.troop.root_id, self.district.id)
+        self.assertNotIn(self.troop.id, set(
+            Faction.objects.filter(id__in=self.faction.get_descendant_ids()).values_list(
+                "id", flat=True
+            )
+        ))
+
+    def test_new_faction_parents_are_scoped_and_depth_checked(self):
+        parents = FactionForm(organization=self.organization).fields["parent"].queryset
+        self.assertIn(self.district, parents)
+        self.assertFalse(parents.exclude(organization=self.organization).exists())
+        self.assertFalse(FactionForm().fields["parent"].queryset.exists())
+
+        new = Faction(name="New", organization=self.organization)
+        new.validate_move(self.faction)
+        with self.assertRaises(ValidationError):
+            new.validate_move(self.troop)
+
+    def test_tree_snapshot_answers_subtree_without_queries(self):
+        # on_commit hooks do not fire inside TestCase, so bump the version by hand
+        bump_version(TREE_VERSION, self.organization.id)
+        tree = get_faction_tree(self.organization.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                set(tree.descendant_ids(self.district.id)), {self.district.id, self.troop.id}
+            )
+            self.assertEqual(tree.ancestor_ids(self.troop.id)[0], self.district.id)
+
+    def test_tree_snapshot_ancestors_stop_at_soft_deleted_factions(self):
+        self.district.is_deleted = True
+        self.district.save()
+        bump_version(TREE_VERSION, self.organization.id)
+        tree = get_faction_tree(self.organization.id)
+        self.assertEqual(tree.ancestor_ids(self.troop.id), [])
+        self.assertEqual(tree.ancestor_ids(self.district.id), [])
+        self.assertNotIn(self.troop.id, tree.descendant_ids(self.faction.id))
+
+    def test_tree_version_never_repeats_after_eviction(self):
+        tree = get_faction_tree(self.organization.id)
+        cache.delete(version_key(TREE_VERSION, self.organization.id))
+        self.assertIsNot(get_faction_tree(self.organization.id), tree)
+
+    def test_with_ancestors_prefetches_chain(self):
+        troop = Faction.objects.with_ancestors().get(pk=self.troop.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                [ancestor.pk for ancestor in troop.get_ancestors()],
+                [self.faction.pk, self.district.pk],
+            )
+            self.assertEqual(troop.get_root_faction().pk, self.faction.pk)
+            self.assertEqual(troop.parent.pk, self.district.pk)
+
+    def test_ancestor_chains_agree_on_soft_deleted_factions(self):
+        def chains():
+            prefetched = Faction.objects.with_ancestors().get(pk=self.troop.pk)
+            recursive = Faction.objects.get(pk=self.troop.pk)
+            return (
+                [ancestor.pk for ancestor in prefetched.get_ancestors()],
+                [ancestor.pk for ancestor in recursive.get_ancestors()],
+            )
+
+        self.assertEqual(chains(), ([self.faction.pk, self.district.pk],) * 2)
+        self.district.is_deleted = True
+        self.district.save()
+        self.assertEqual(chains(), ([], []))
+
+    def test_in_subtree_filters_profiles_through_closure(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="troop.leader", password="pass12345", user_type=User.UserType.LEADER
+            )
+        profile = LeaderProfile.objects.create(
+            user=user, organization=self.organization, faction=self.troop
+        )
+        self.assertEqual(list(LeaderProfile.objects.in_subtree(self.district)), [profile])
+        self.assertEqual(
+            list(LeaderProfile.objects.in_subtree(self.troop, include_self=False)), []
+        )
+
+    def test_export_and_import_require_leading_the_faction(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="district.leader", password="pass12345", user_type=User.UserType.LEADER
+            )
+        profile = LeaderProfile.objects.create(
+            user=user, organization=self.organization, faction=self.district
+        )
+        self.assertTrue(leads_faction(user, self.troop))
+        self.assertFalse(leads_faction(user, self.faction))
+        self.assertFalse(leads_faction(user, self.troop, admin=True))
+        self.assertFalse(leads_faction(user, self.organization, admin=True))
+
+        factory = APIRequestFactory()
+        export = FactionViewSet.as_view({"get": "export"})
+        import_tree = FactionViewSet.as_view({"post": "import_tree"})
+
+        def call(view, request, **kwargs):
+            force_authenticate(request, user=user)
+            return view(request, **kwargs)
+
+        self.assertEqual(call(export, factory.get("/"), pk=self.faction.pk).status_code, 403)
+        self.assertEqual(call(export, factory.get("/"), pk=self.troop.pk).status_code, 200)
+        payload = {
+            "organization": self.organization.pk,
+            "parent": self.troop.pk,
+            "factions": [{"name": "Patrol"}],
+        }
+        self.assertEqual(call(import_tree, factory.post("/", payload, format="json")).status_code, 403)
+
+        profile.is_admin = True
+        profile.save()
+        payload["parent"] = self.district.pk
+        self.assertEqual(call(import_tree, factory.post("/", payload, format="json")).status_code, 201)
+
+    def test_moves_require_leader_admin_of_both_ends(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="move.leader", password="pass12345", user_type=User.UserType.LEADER
+            )
+        profile = LeaderProfile.objects.create(
+            user=user, organization=self.organization, faction=self.district
+        )
+        factory = APIRequestFactory()
+        move = FactionViewSet.as_view({"post": "move"})
+        update = FactionViewSet.as_view({"patch": "partial_update"})
+
+        def call(view, request, **kwargs):
+            force_authenticate(request, user=user)
+            return view(request, **kwargs)
+
+        payload = {"parent": self.faction.pk}
+        self.assertEqual(call(move, factory.post("/", payload), pk=self.troop.pk).status_code, 403)
+        profile.is_admin = True
+        profile.save()
+        # Admin of the troop's district, but not of the target faction above it
+        self.assertEqual(call(move, factory.post("/", payload), pk=self.troop.pk).status_code, 403)
+        self.assertEqual(
+            call(update, factory.patch("/", payload, format="json"), pk=self.troop.pk).status_code,
+            403,
+        )
+
+        profile.faction = self.faction
+        profile.save()
+        response = call(
+            update,
+            factory.patch("/", {**payload, "name": "Moved Troop"}, format="json"),
+            pk=self.troop.pk,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.troop.refresh_from_db()
+        self.assertEqual((self.troop.parent_id, self.troop.name), (self.faction.pk, "Moved Troop"))
+
+    def test_subtree_member_counts_in_one_query(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="count.leader", password="pass12345", user_type=User.UserType.LEADER
+            )
+        LeaderProfile.objects.create(user=user, organization=self.organization, faction=self.troop)
+        with self.assertNumQueries(1):
+            counts = {
+                faction.pk: faction.total_leader_count
+                for faction in Faction.objects.filter(
+                    pk__in=[self.faction.pk, self.district.pk, self.troop.pk]
+                ).with_subtree_member_counts()
+            }
+        self.assertEqual(counts[self.troop.pk], 1)
+        self.assertEqual(counts[self.district.pk], 1)
+        self.assertGreaterEqual(counts[self.faction.pk], 1)
+
+    def test_member_counters_follow_profiles_and_moves(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="counter.leader", password="pass12345", user_type=User.UserType.LEADER
+            )
+        profile = LeaderProfile.objects.create(
+            user=user, organization=self.organization, faction=self.troop
+        )
+        self.district.refresh_from_db()
+        self.assertEqual(self.district.member_counts()["leader"], 1)
+        self.assertEqual(self.district.member_counts(include_descendants=False)["leader"], 0)
+
+        self.troop.refresh_from_db()
+        self.troop.move_to(self.faction)
+        self.district.refresh_from_db()
+        self.assertEqual(self.district.member_counts()["leader"], 0)
+
+        profile.delete()
+        self.troop.refresh_from_db()
+        self.assertEqual(self.troop.member_counts()["leader"], 0)
+
+    def test_reconcile_faction_counts_fixes_drift(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="drift.leader", password="pass12345", user_type=User.UserType.LEADER
+            )
+        LeaderProfile.objects.create(user=user, organization=self.organization, faction=self.troop)
+        Faction.objects.filter(pk=self.district.pk).update(subtree_leader_count=7)
+
+        out = StringIO()
+        call_command("reconcile_faction_counts", "--dry-run", stdout=out)
+        self.assertIn("factions with drifted counters.", out.getvalue())
+        self.district.refresh_from_db()
+        self.assertEqual(self.district.member_counts()["leader"], 7)
+
+        call_command("reconcile_faction_counts", "--batch-size", "2", stdout=StringIO())
+        self.district.refresh_from_db()
+        self.assertEqual(self.district.member_counts()["leader"], 1)
+
+    def test_reconcile_faction_counts_locks_rows_before_recounting(self):
+        with CaptureQueriesContext(connection) as queries:
+            call_command("reconcile_faction_counts", stdout=StringIO())
+        sql = [query["sql"] for query in queries.captured_queries]
+        stored = next(
+            index for index, statement in enumerate(sql)
+            if Faction._meta.db_table in statement and "subtree_leader_count" in statement
+        )
+        recount = next(
+            index for index, statement in enumerate(sql)
+            if LeaderProfile._meta.db_table in statement
+        )
+        self.assertLess(stored, recount)
+        if connection.features.has_select_for_update:
+            self.assertIn("FOR UPDATE", sql[stored])
+
+    def test_hard_delete_releases_ancestor_counters(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="deleted.leader", password="pass12345", user_type=User.UserType.LEADER
+            )
+        LeaderProfile.objects.create(user=user, organization=self.organization, faction=self.troop)
+        self.district.refresh_from_db()
+        self.assertEqual(self.district.member_counts()["leader"], 1)
+
+        Faction.objects.get(pk=self.troop.pk).delete()
+        self.district.refresh_from_db()
+        self.assertEqual(self.district.member_counts()["leader"], 0)
+
+    def test_member_counts_reads_every_type_from_counters(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="multi.leader", password="pass12345", user_type=User.UserType.LEADER
+            )
+        LeaderProfile.objects.create(user=user, organization=self.organization, faction=self.troop)
+        self.district.refresh_from_db()
+        with self.assertNumQueries(0):
+            counts = self.district.member_counts()
+            direct = self.district.member_counts(include_descendants=False)
+        self.assertEqual(counts, {"attendee": 0, "leader": 1})
+        self.assertEqual(direct, {"attendee": 0, "leader": 0})
+
+    def test_roster_queryset_unions_profiles_in_sql(self):
+        with mute_profile_signals():
+            leader = User.objects.create_user(
+                username="b.leader", password="pass12345", user_type=User.UserType.LEADER
+            )
+            attendee = User.objects.create_user(
+                username="a.attendee", password="pass12345", user_type=User.UserType.ATTENDEE
+            )
+        LeaderProfile.objects.create(user=leader, organization=self.organization, faction=self.troop)
+        AttendeeProfile.objects.create(
+            user=attendee, organization=self.organization, faction=self.district
+        )
+        roster = roster_queryset(self.district).order_by("username")
+        self.assertEqual(roster.count(), 2)
+        self.assertEqual(
+            [(row["username"], row["member_type"]) for row in roster[:2]],
+            [("a.attendee", "attendee"), ("b.leader", "leader")],
+        )
+
+    def test_keyset_paginator_walks_roster_both_ways(self):
+        with mute_profile_signals():
+            for index in range(5):
+                user = User.objects.create_user(
+                    username=f"keyset.{index}", password="pass12345", user_type=User.UserType.LEADER
+                )
+                LeaderProfile.objects.create(
+                    user=user, organization=self.organization, faction=self.troop
+                )
+        paginator = KeysetPaginator("username", "member_id", per_page=2)
+
+        def source(condition):
+            return roster_queryset(self.district, condition)
+
+        first = paginator.page(source)
+        second = paginator.page(source, first.next_cursor)
+        third = paginator.page(source, second.next_cursor)
+        self.assertEqual([row["username"] for row in second], ["keyset.2", "keyset.3"])
+        self.assertEqual([row["username"] for row in third], ["keyset.4"])
+        self.assertFalse(first.has_previous())
+        self.assertFalse(third.has_next())
+
+        back = paginator.page(source, third.previous_cursor)
+        self.assertEqual([row["username"] for row in back], ["keyset.2", "keyset.3"])
+        self.assertEqual(
+            [row["username"] for row in paginator.page(source, "not-a-cursor")],
+            ["keyset.0", "keyset.1"],
+        )
+
+    def test_keyset_paginator_breaks_roster_ties_across_tables(self):
+        with mute_profile_signals():
+            for index in range(3):
+                for user_type, model in (
+                    (User.UserType.LEADER, LeaderProfile),
+                    (User.UserType.ATTENDEE, AttendeeProfile),
+                ):
+                    user = User.objects.create_user(
+                        username=f"tie.{user_type}.{index}", password="pass12345", user_type=user_type
+                    )
+                    model.objects.create(user=user, organization=self.organization, faction=self.troop)
+        paginator = KeysetPaginator("faction_name", ("member_type", "member_id"), per_page=2)
+
+        def source(condition):
+            return roster_queryset(self.district, condition)
+
+        seen, cursor = [], None
+        while True:
+            page = paginator.page(source, cursor)
+            seen.extend((row["member_type"], row["member_id"]) for row in page)
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(len(set(seen)), 6)
+
+    def test_profile_api_pages_by_username(self):
+        with mute_profile_signals():
+            viewer = User.objects.create_user(
+                username="api.viewer", password="pass12345", user_type=User.UserType.LEADER
+            )
+            users = [
+                User.objects.create_user(
+                    username=f"api.leader.{index}", password="pass12345", user_type=User.UserType.LEADER
+                )
+                for index in range(3)
+            ]
+        profiles = [
+            LeaderProfile.objects.create(user=user, organization=self.organization, faction=self.troop)
+            for user in users
+        ]
+        view = LeaderViewSet.as_view({"get": "list"})
+        factory = APIRequestFactory()
+        seen, url = [], f"/?faction={self.troop.pk}&page_size=2"
+        while url:
+            request = factory.get(url)
+            force_authenticate(request, user=viewer)
+            response = view(request)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(seen, [profile.pk for profile in profiles])
+
+        request = factory.get("/?faction=abc")
+        force_authenticate(request, user=viewer)
+        self.assertEqual(view(request).status_code, 400)
+
+    async def test_keyset_apage_reads_rows_with_async_orm(self):
+        factions = Faction.objects.filter(pk__in=[self.district.pk, self.troop.pk])
+        paginator = KeysetPaginator("name", per_page=1)
+        first = await paginator.apage(factions)
+        second = await paginator.apage(factions, first.next_cursor)
+        self.assertTrue(first.has_next())
+        self.assertFalse(second.has_next())
+        self.assertEqual(
+            {first.rows[0].pk, second.rows[0].pk}, {self.district.pk, self.troop.pk}
+        )
+
+    def test_roster_csv_streams_table_columns(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="csv.leader",
+                password="pass12345",
+                user_type=User.UserType.LEADER,
+                email="csv@example.com",
+            )
+        LeaderProfile.objects.create(user=user, organization=self.organization, faction=self.troop)
+        lines = list(iter_roster_csv(self.district))
+        self.assertEqual(lines[0], "Username,First Name,Last Name,Email,User Type,Faction\r\n")
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith("csv.leader,"))
+        self.assertIn("csv@example.com", lines[1])
+
+    def test_search_members_is_scoped_and_ranked(self):
+        with mute_profile_signals():
+            janet = User.objects.create_user(
+                username="janet.scout", password="pass12345", user_type=User.UserType.ATTENDEE
+            )
+            outside = User.objects.create_user(
+                username="janet.elsewhere", password="pass12345", user_type=User.UserType.ATTENDEE
+            )
+            other = User.objects.create_user(
+                username="bob.scout", password="pass12345", user_type=User.UserType.ATTENDEE
+            )
+        for user, faction in ((janet, self.troop), (outside, self.faction), (other, self.troop)):
+            AttendeeProfile.objects.create(user=user, organization=self.organization, faction=faction)
+
+        results = AttendeeProfile.objects.in_subtree(self.district).search_members("janet")
+        self.assertEqual([profile.user.username for profile in results], ["janet.scout"])
+        self.assertIsNotNone(results[0].search_rank)
+        self.assertEqual(
+            {row["username"] for row in roster_queryset(self.district, query="scout")},
+            {"janet.scout", "bob.scout"},
+        )
+
+    def test_search_index_follows_user_edits(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="renamed.scout", password="pass12345", user_type=User.UserType.ATTENDEE
+            )
+        AttendeeProfile.objects.create(user=user, organization=self.organization, faction=self.troop)
+        user.username = "renamed.ranger"
+        user.save()
+
+        profiles = AttendeeProfile.objects.in_subtree(self.district)
+        self.assertFalse(profiles.search_members("scout").exists())
+        self.assertTrue(profiles.search_members("ranger").exists())
+        # update() sends no signals; the rebuild command catches it up.
+        User.objects.filter(pk=user.pk).update(username="renamed.rover")
+        call_command("rebuild_member_search_index", stdout=StringIO())
+        self.assertTrue(profiles.search_members("rover").exists())
+
+    def test_roster_renders_search_results_best_match_first(self):
+        with mute_profile_signals():
+            weaker = User.objects.create_user(
+                username="alpha.leader",
+                password="pass12345",
+                user_type=User.UserType.LEADER,
+                email="scout@example.com",
+            )
+            stronger = User.objects.create_user(
+                username="zulu.scout",
+                password="pass12345",
+                user_type=User.UserType.LEADER,
+                first_name="Scout",
+                last_name="Scout",
+            )
+        for user in (weaker, stronger):
+            LeaderProfile.objects.create(user=user, organization=self.organization, faction=self.troop)
+
+        view = RosterView()
+        view.setup(RequestFactory().get("/", {"q": "scout"}), slug=self.district.slug)
+        table = view.get_table(**view.get_table_kwargs())
+        self.assertEqual(
+            [row.record["username"] for row in table.rows], ["zulu.scout", "alpha.leader"]
+        )
+
+    def test_index_widens_to_subtree_only_for_searches(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="nested.scout", password="pass12345", user_type=User.UserType.ATTENDEE
+            )
+        AttendeeProfile.objects.create(user=user, organization=self.organization, faction=self.troop)
+
+        def listed(**params):
+            view = AttendeeIndexView()
+            view.setup(RequestFactory().get("/", params), faction_slug=self.district.slug)
+            return [profile.user.username for profile in view.get_queryset()]
+
+        self.assertEqual(listed(), [])
+        self.assertEqual(listed(q="nested"), ["nested.scout"])
+
+    def test_get_versions_reads_namespaces_together(self):
+        pairs = ((SUBTREE_VERSION, self.troop.pk), (ENROLLMENT_VERSION, self.troop.pk))
+        before = get_versions(*pairs)
+        self.assertEqual(get_versions(*pairs), before)
+        bump_version(ENROLLMENT_VERSION, self.troop.pk)
+        after = get_versions(*pairs)
+        self.assertEqual(after[0], before[0])
+        self.assertNotEqual(after[1], before[1])
+
+    def test_profile_and_user_edits_bump_subtree_version(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="version.leader", password="pass12345", user_type=User.UserType.LEADER
+            )
+        profile = LeaderProfile.objects.create(
+            user=user, organization=self.organization, faction=self.troop
+        )
+
+        def version():
+            return get_versions((SUBTREE_VERSION, self.troop.pk))[0]
+
+        before = version()
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.is_admin = True
+            profile.save()
+        self.assertNotEqual(version(), before)
+
+        before = version()
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save(update_fields=["last_login"])
+        self.assertEqual(version(), before)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.first_name = "Renamed"
+            user.save()
+        self.assertNotEqual(version(), before)
+
+    def test_manage_panel_builds_only_its_table(self):
+        view = ManagePanelView()
+        view.kwargs = {"faction_slug": self.district.slug, "panel": "attendees"}
+        self.assertEqual(list(view.get_tables_config()), ["attendees"])
+        view.kwargs["panel"] = "unknown"
+        with self.assertRaises(Http404):
+            view.get_tables_config()
+
+    def test_cached_widget_data_invalidates_per_faction(self):
+        calls = []
+        widget = CachedWidgetData(
+            "test_widget",
+            lambda faction: calls.append(faction.pk) or len(calls),
+            ttl=60,
+            invalidated_by=("faction.AttendeeProfile", "enrollment.FactionEnrollment"),
+        )
+        self.assertEqual(widget(self.troop, portal="faction"), 1)
+        self.assertEqual(widget(self.troop, portal="faction"), 1)
+        self.assertEqual(widget(self.troop, portal="attendee"), 2)
+        self.assertEqual(widget(self.district, portal="faction"), 3)
+        bump_version(ENROLLMENT_VERSION, self.troop.pk)
+        self.assertEqual(widget(self.troop, portal="faction"), 4)
+        self.assertEqual(widget(self.district, portal="faction"), 3)
+
+    def test_declared_models_bump_their_faction_and_below(self):
+        namespace = model_version_namespace("pages.Announcement")
+        self.assertEqual(model_version_namespace("faction.LeaderProfile"), SUBTREE_VERSION)
+        pairs = [(namespace, faction.pk) for faction in (self.faction, self.district, self.troop)]
+        before = get_versions(*pairs)
+
+        announcement = SimpleNamespace(faction_id=self.district.pk)
+        sender = SimpleNamespace(_meta=SimpleNamespace(label_lower="pages.announcement"))
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_declared_model_version(sender, announcement)
+
+        after = get_versions(*pairs)
+        self.assertEqual(after[0], before[0])
+        self.assertNotEqual(after[1], before[1])
+        self.assertNotEqual(after[2], before[2])
+
+    def test_manage_view_resolves_scope_once(self):
+        view = FactionManageView()
+        view.kwargs = {"faction_slug": self.district.slug}
+        with self.assertNumQueries(1):
+            first = view.get_scope_object()
+            self.assertIs(view.get_scope_object(), first)
+
+
+class FactionTreeImporterTests(BaseDomainTestCase):
+    def test_import_json_builds_hierarchy(self):
+        importer = FactionTreeImporter(self.organization, parent=self.faction)
+        created = importer.import_json(
+            [{"name": "North District", "children": [{"name": "Troop 1"}, {"name": "Troop 1"}]}]
+        )
+        district, first, second = created
+        self.assertNotEqual(first.slug, second.slug)
+        self.assertEqual(second.parent_id, district.pk)
+        self.assertEqual(second.depth, self.faction.depth + 2)
+        self.assertEqual(
+            set(Faction.objects.filter(id__in=self.faction.get_descendant_ids()).values_list(
+                "id", flat=True
+            )),
+            {self.faction.pk, district.pk, first.pk, second.pk},
+        )
+
+    def test_import_rejects_deleted_anchor(self):
+        self.faction.is_deleted = True
+        self.faction.save()
+        with self.assertRaises(ValidationError):
+            FactionTreeImporter(self.organization).run(
+                [{"key": 1, "parent_key": None, "parent_id": self.faction.pk, "name": "Troop",
+                  "description": "", "abbreviation": "", "slug": ""}]
+            )
+
+    def test_import_csv_rejects_unknown_parent(self):
+        importer = FactionTreeImporter(self.organization)
+        with self.assertRaises(ValidationError):
+            importer.import_csv("id,parent,name\n1,missing-slug,Troop\n")
+
+
+class AsyncViewTests(BaseDomainTestCase):
+    def setUp(self):
+        super().setUp()
+        self.district = Faction.objects.create(
+            name="District", organization=self.organization, parent=self.faction
+        )
+        self.troop = Faction.objects.create(
+            name="Troop", organization=self.organization, parent=self.district
+        )
+        with mute_profile_signals():
+            self.district_leader = User.objects.create_user(
+                username="async.district", password="pass12345", user_type=User.UserType.LEADER
+            )
+            self.troop_leader = User.objects.create_user(
+                username="async.troop", password="pass12345", user_type=User.UserType.LEADER
+            )
+            attendees = [
+                User.objects.create_user(
+                    username=username, password="pass12345", user_type=User.UserType.ATTENDEE
+                )
+                for username in ("async.a", "async.b", "async.nested")
+            ]
+        LeaderProfile.objects.create(
+            user=self.district_leader, organization=self.organization, faction=self.district
+        )
+        LeaderProfile.objects.create(
+            user=self.troop_leader, organization=self.organization, faction=self.troop
+        )
+        for user, faction in zip(attendees, (self.district, self.district, self.troop)):
+            AttendeeProfile.objects.create(user=user, organization=self.organization, faction=faction)
+
+    def url(self, name, faction):
+        return reverse(f"factions:async:{name}", kwargs={"faction_slug": faction.slug})
+
+    async def test_pages_require_a_leader_of_the_faction(self):
+        url = self.url("roster", self.district)
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 302)
+
+        await self.async_client.aforce_login(self.troop_leader)
+        for name in ("roster", "attendee_index", "leader_index"):
+            response = await self.async_client.get(self.url(name, self.district))
+            self.assertEqual(response.status_code, 403)
+        response = await self.async_client.get(self.url("roster", self.troop))
+        self.assertEqual(response.status_code, 200)
+
+    async def test_attendee_index_scopes_and_pages(self):
+        await self.async_client.aforce_login(self.district_leader)
+        url = self.url("attendee_index", self.district)
+        seen = []
+        with mock.patch.object(AsyncAttendeeIndexView, "paginate_by", 1):
+            next_url = url
+            while next_url:
+                response = await self.async_client.get(next_url)
+                self.assertEqual(response.status_code, 200)
+                seen.extend(row.record.user.username for row in response.context["table"].rows)
+                page_url = response.context["next_page_url"]
+                next_url = f"{url}{page_url}" if page_url else None
+        self.assertEqual(seen, ["async.a", "async.b"])
+
+        response = await self.async_client.get(url, {"q": "nested"})
+        self.assertEqual(
+            [row.record.user.username for row in response.context["table"].rows],
+            ["async.nested"],
+        )
+
+    async def test_profile_api_rejects_non_numeric_faction(self):
+        await self.async_client.aforce_login(self.district_leader)
+        response = await self.async_client.get(
+            reverse("factions:async:attendee-list"), {"faction": "abc"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class CachedReverseTests(TestCase):
+    def test_reverse_url_matches_reverse(self):
+        table = AttendeeTable([])
+        for faction_slug, slug in (("troop-1", "jane_doe"), ("troop-1", "bob"), ("troop-2", "a__b")):
+            kwargs = {"faction_slug": faction_slug, "slug": slug}
+            self.assertEqual(
+                table.reverse_url("factions:attendees:show", kwargs=kwargs),
+                reverse("factions:attendees:show", kwargs=kwargs),
+            )
+
+
+class ConcurrentWidgetTests(SimpleTestCase):
+    class Dashboard(ConcurrentWidgetMixin):
+        concurrent_widgets = True
+        widget_timeouts = {"get_slow_widget": 0.05}
+        request = SimpleNamespace(user=SimpleNamespace(pk=1))
+
+        def get_fast_widget(self, _definition):
+            return {"items": [1]}
+
+        def get_slow_widget(self, _definition):
+            time.sleep(0.5)
+            return {"items": [2]}
+
+    def test_widgets_run_concurrently_with_timeouts(self):
+        started = time.monotonic()
+        results = self.Dashboard().evaluate_widgets()
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(results, {"get_fast_widget": {"items": [1]}, "get_slow_widget": None})
+
+    def test_saturated_pool_runs_queued_widgets_inline(self):
+        class Dashboard(ConcurrentWidgetMixin):
+            concurrent_widgets = True
+            widget_timeout = 0.05
+            request = SimpleNamespace(user=SimpleNamespace(pk=1))
+
+            def get_fast_widget(self, _definition):
+                return {"items": [1]}
+
+        executor = get_widget_executor()
+        release = threading.Event()
+        for _ in range(executor._max_workers):
+            executor.submit(release.wait, 5)
+        try:
+            started = time.monotonic()
+            results = Dashboard().evaluate_widgets()
+            self.assertLess(time.monotonic() - started, 1)
+        finally:
+            release.set()
+        self.assertEqual(results, {"get_fast_widget": {"items": [1]}})
+
+    def test_widget_pool_is_shared_across_requests(self):
+        self.assertIs(get_widget_executor(), get_widget_executor())
+        self.Dashboard().evaluate_widgets()
+        self.assertIs(get_widget_executor(), get_widget_executor())
@@ -0,0 +1,107 @@
+# faction/tree.py
+""" Process-local Faction Tree Snapshots. """
+
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+from .cache import TREE_VERSION, get_version
+from .models.faction import Faction
+
+FactionNode = namedtuple(
+    "FactionNode", ["id", "parent_id", "slug", "depth", "is_deleted", "children"]
+)
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+class FactionTreeSnapshot:
+    """
+    Read-only adjacency view of one organization's Faction tree.
+
+    Built with a single query and shared by every request in the process until
+    the organization's tree version changes. It answers in-memory questions
+    such as the sub-faction count in ``faction_counts``; querysets scoped to a
+    subtree keep using the lazy closure subquery, which stays inside one SQL
+    statement instead of sending the snapshot's ids as a parameter list.
+    """
+
+    def __init__(self, organization_id, version, rows):
+        children = {}
+        for pk, parent_id, *_ in rows:
+            children.setdefault(parent_id, []).append(pk)
+        self.organization_id = organization_id
+        self.version = version
+        self.nodes = MappingProxyType(
+            {
+                pk: FactionNode(pk, parent_id, slug, depth, is_deleted, tuple(children.get(pk, ())))
+                for pk, parent_id, slug, depth, is_deleted in rows
+            }
+        )
+        self.slugs = MappingProxyType({node.slug: node.id for node in self.nodes.values()})
+
+    @classmethod
+    def build(cls, organization_id, version):
+        rows = Faction.objects.filter(organization_id=organization_id).values_list(
+            "id", "parent_id", "slug", "depth", "is_deleted"
+        )
+        return cls(organization_id, version, list(rows))
+
+    def __contains__(self, faction_id):
+        return faction_id in self.nodes
+
+    def get(self, faction_id):
+        return self.nodes.get(faction_id)
+
+    def children_of(self, faction_id, include_deleted=False):
+        node = self.nodes.get(faction_id)
+        if node is None:
+            return ()
+        return tuple(
+            child for child in node.children if include_deleted or not self.nodes[child].is_deleted
+        )
+
+    def descendant_ids(self, faction_id, include_self=True, include_deleted=False):
+        """
+        Return the ids under ``faction_id``; soft-deleted subtrees are skipped.
+        """
+        if faction_id not in self.nodes:
+            return []
+        ids = [faction_id] if include_self else []
+        stack = list(self.children_of(faction_id, include_deleted))
+        while stack:
+            current = stack.pop()
+            ids.append(current)
+            stack.extend(self.children_of(current, include_deleted))
+        return ids
+
+    def ancestor_ids(self, faction_id):
+        """
+        Return the ids above ``faction_id``, nearest parent first.
+
+        Like ``descendant_ids()`` and the closure table, the walk stops at
+        soft-deleted factions: a deleted faction, or one below a deleted
+        ancestor, reaches no ancestors beyond that boundary.
+        """
+        ids = []
+        node = self.nodes.get(faction_id)
+        if node is None or node.is_deleted:
+            return ids
+        while node.parent_id in self.nodes and not self.nodes[node.parent_id].is_deleted:
+            ids.append(node.parent_id)
+            node = self.nodes[node.parent_id]
+        return ids
+
+
+def get_faction_tree(organization_id):
+    """
+    Return the current snapshot for ``organization_id``, rebuilding it if stale.
+    """
+    version = get_version(TREE_VERSION, organization_id)
+    snapshot = _snapshots.get(organization_id)
+    if snapshot is None or snapshot.version != version:
+        snapshot = FactionTreeSnapshot.build(organization_id, version)
+        with _snapshots_lock:
+            _snapshots[organization_id] = snapshot
+    return snapshot
@@ -6,4 +6,6 @@ urlpatterns = [
     path('factions/', include('faction.urls.faction')),
     path('attendees/', include('faction.urls.attendee')),
     path('leaders/', include('faction.urls.leader')),
+    # Async read paths for ASGI deployments
+    path('async/', include('faction.urls.asynchronous')),
 ]
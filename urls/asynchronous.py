@@ -0,0 +1,41 @@
+# faction/urls/asynchronous.py
+
+from django.urls import path
+
+from faction.views.asynchronous import (
+    AsyncAttendeeApiView,
+    AsyncAttendeeIndexView,
+    AsyncFactionApiView,
+    AsyncLeaderApiView,
+    AsyncLeaderIndexView,
+    AsyncRosterView,
+    AsyncShowView,
+)
+
+app_name = "async"
+
+urlpatterns = [
+    # Read API
+    path("api/factions/", AsyncFactionApiView.as_view(), name="faction-list"),
+    path("api/factions/<int:pk>/", AsyncFactionApiView.as_view(), name="faction-detail"),
+    path("api/attendees/", AsyncAttendeeApiView.as_view(), name="attendee-list"),
+    path("api/attendees/<int:pk>/", AsyncAttendeeApiView.as_view(), name="attendee-detail"),
+    path("api/leaders/", AsyncLeaderApiView.as_view(), name="leader-list"),
+    path("api/leaders/<int:pk>/", AsyncLeaderApiView.as_view(), name="leader-detail"),
+    # Pages
+    path("factions/<slug:faction_slug>/roster/", AsyncRosterView.as_view(), name="roster"),
+    path(
+        "factions/<slug:faction_slug>/attendees/",
+        AsyncAttendeeIndexView.as_view(),
+        name="attendee_index",
+    ),
+    path(
+        "factions/<slug:faction_slug>/leaders/", AsyncLeaderIndexView.as_view(), name="leader_index"
+    ),
+    path("factions/<slug:faction_slug>/", AsyncShowView.as_view(), name="show"),
+    path(
+        "factions/<slug:faction_slug>/<slug:child_slug>/",
+        AsyncShowView.as_view(),
+        name="show_child",
+    ),
+]
@@ -11,6 +11,7 @@ from faction.views.faction import (
     UpdateView,
     DeleteView,
     ManageView,
+    ManagePanelView,
     RosterView,
 )
 
@@ -20,6 +21,9 @@ app_name = "factions"
 urlpatterns = [
     path("", IndexView.as_view(), name="index"),
     path("<slug:faction_slug>/manage/", ManageView.as_view(), name="manage"),
+    path(
+        "<slug:faction_slug>/manage/<slug:panel>/", ManagePanelView.as_view(), name="manage_panel"
+    ),
     path("new/", CreateView.as_view(), name="new"),
     path("<slug:faction_slug>", ShowView.as_view(), name="show"),
     path("<slug:faction_slug>/<slug:child_slug>/", ShowView.as_view(), name="show_child"),
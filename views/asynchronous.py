@@ -0,0 +1,256 @@
+# faction/views/asynchronous.py
+"""
+Async read views for ASGI deployments.
+
+Rows are read with the async ORM (``aget``, ``async for``), so a request
+waiting on the database holds no thread. Permission checks reuse the sync
+helpers through ``sync_to_async``; table building, template rendering and
+serializer output, which may still follow lazy relations, go the same way
+once the rows are loaded.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.core.exceptions import BadRequest, PermissionDenied
+from django.http import JsonResponse
+from django.shortcuts import aget_object_or_404, render
+from django.views import View
+from django_tables2 import RequestConfig
+
+from ..models.attendee import AttendeeProfile
+from ..models.faction import Faction
+from ..models.leader import LeaderProfile
+from ..pagination import KeysetPaginator
+from ..permissions import leads_faction
+from ..querysets.roster import roster_queryset
+from ..serializers import AttendeeSerializer, FactionSerializer, LeaderSerializer
+from ..tables.attendee import AttendeeTable
+from ..tables.leader import LeaderTable
+from ..tables.roster import RosterTable
+from . import attendee as attendee_views
+from . import faction as faction_views
+from . import leader as leader_views
+from .mixins import KeysetTableMixin
+
+
+class AsyncReadView(View):
+    """
+    Resolve the user with ``request.auser()`` and check access before the handler runs.
+    """
+
+    login_required = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.user = await request.auser()
+        if not await self.has_permission():
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def has_permission(self):
+        return self.user.is_authenticated or not self.login_required
+
+    def handle_no_permission(self):
+        if not self.user.is_authenticated:
+            return redirect_to_login(self.request.get_full_path())
+        raise PermissionDenied
+
+    async def render(self, context):
+        return await sync_to_async(render)(self.request, self.template_name, context)
+
+
+class AsyncShowView(AsyncReadView):
+    """Async ``faction.ShowView``."""
+
+    template_name = faction_views.ShowView.template_name
+    login_required = False
+
+    async def get(self, request, faction_slug, child_slug=None):
+        faction = await aget_object_or_404(
+            Faction.objects.with_ancestors(), slug=child_slug or faction_slug, is_deleted=False
+        )
+        child_factions = [child async for child in faction.children.filter(is_deleted=False)]
+        return await self.render(
+            {
+                "object": faction,
+                "faction": faction,
+                "child_factions": child_factions,
+                "parent_faction": faction.parent,
+                "ancestors": faction.get_ancestors(),
+            }
+        )
+
+
+class AsyncKeysetTableView(KeysetTableMixin, AsyncReadView):
+    """
+    Render one keyset page of a faction's members, loading the rows with ``async for``.
+
+    Only leaders of the faction (or of one of its ancestors) get the page.
+    By default it lists the faction's own ``model`` profiles and widens to
+    the subtree when searching, like the sync index views.
+    """
+
+    model = None
+    table_class = None
+
+    async def has_permission(self):
+        if not await super().has_permission():
+            return False
+        self.faction = await self.get_faction()
+        return await sync_to_async(leads_faction)(self.user, self.faction)
+
+    async def get_faction(self):
+        slug = self.kwargs.get("faction_slug") or self.kwargs.get("slug")
+        return await aget_object_or_404(Faction, slug=slug, is_deleted=False)
+
+    def get_keyset_source_for(self, faction):
+        queryset = self.model.objects.select_related("user", "faction", "organization")
+        query = self.get_search_query()
+        queryset = queryset.in_subtree(faction) if query else queryset.filter(faction=faction)
+        return queryset.search_members(query)
+
+    def get_table_kwargs(self):
+        return {"order_by": ()}
+
+    def render_table(self, page):
+        # Table columns may follow lazy relations, so the table is built and
+        # configured off the event loop together with the template.
+        table = self.table_class(page.rows, **self.get_table_kwargs())
+        RequestConfig(self.request, paginate=False).configure(table)
+        context = {"table": table, "faction": self.faction, **self.get_keyset_context(page)}
+        return render(self.request, self.template_name, context)
+
+    async def get(self, request, *args, **kwargs):
+        page = await self.get_keyset_paginator().apage(
+            self.get_keyset_source_for(self.faction), request.GET.get(self.cursor_kwarg)
+        )
+        return await sync_to_async(self.render_table)(page)
+
+
+class AsyncRosterView(AsyncKeysetTableView):
+    """Async ``RosterView``."""
+
+    table_class = RosterTable
+    template_name = faction_views.RosterView.template_name
+    paginate_by = faction_views.RosterView.paginate_by
+    keyset_sort_fields = faction_views.RosterView.keyset_sort_fields
+    keyset_id_field = faction_views.RosterView.keyset_id_field
+
+    def get_keyset_source_for(self, faction):
+        query = self.get_search_query()
+        return lambda condition: roster_queryset(faction, condition, query)
+
+
+class AsyncAttendeeIndexView(AsyncKeysetTableView):
+    """Async ``attendee.IndexView``."""
+
+    model = AttendeeProfile
+    table_class = AttendeeTable
+    template_name = attendee_views.IndexView.template_name
+    paginate_by = attendee_views.IndexView.paginate_by
+    keyset_sort_fields = attendee_views.IndexView.keyset_sort_fields
+
+
+class AsyncLeaderIndexView(AsyncKeysetTableView):
+    """Async ``leader.IndexView``."""
+
+    model = LeaderProfile
+    table_class = LeaderTable
+    template_name = leader_views.IndexView.template_name
+    paginate_by = leader_views.IndexView.paginate_by
+    keyset_sort_fields = leader_views.IndexView.keyset_sort_fields
+
+    def get_table_kwargs(self):
+        return {**super().get_table_kwargs(), "user": self.user}
+
+
+class AsyncApiView(AsyncReadView):
+    """
+    Async list/retrieve for the read actions of a viewset, answered with ``JsonResponse``.
+
+    Lists are keyset-paginated on ``sort_field`` with ``?cursor=``, in the
+    same ``{"next", "previous", "results"}`` shape as the DRF viewsets.
+    """
+
+    queryset = None
+    serializer_class = None
+    sort_field = "pk"
+    page_size = 25
+
+    async def has_permission(self):
+        return self.user.is_authenticated and self.user.is_active
+
+    def handle_no_permission(self):
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=403
+        )
+
+    async def get_queryset(self):
+        return self.queryset.all()
+
+    def get_paginator(self, queryset):
+        return KeysetPaginator(self.sort_field, per_page=self.page_size)
+
+    async def serialize(self, data, many=False):
+        def to_representation():
+            return self.serializer_class(data, many=many, context={"request": self.request}).data
+
+        return await sync_to_async(to_representation)()
+
+    def get_cursor_url(self, cursor):
+        if cursor is None:
+            return None
+        params = self.request.GET.copy()
+        params["cursor"] = cursor
+        return self.request.build_absolute_uri(f"?{params.urlencode()}")
+
+    async def get(self, request, pk=None):
+        queryset = await self.get_queryset()
+        if pk is not None:
+            instance = await aget_object_or_404(queryset, pk=pk)
+            return JsonResponse(await self.serialize(instance))
+
+        page = await self.get_paginator(queryset).apage(queryset, request.GET.get("cursor"))
+        return JsonResponse(
+            {
+                "next": self.get_cursor_url(page.next_cursor),
+                "previous": self.get_cursor_url(page.previous_cursor),
+                "results": await self.serialize(page.rows, many=True),
+            }
+        )
+
+
+class AsyncProfileApiView(AsyncApiView):
+    """Profile reads with the viewsets' ``?faction=<id>`` scoping and ``?q=`` search."""
+
+    sort_field = "user__username"
+
+    async def get_queryset(self):
+        queryset = self.queryset.all()
+        faction_id = self.request.GET.get("faction")
+        if faction_id:
+            if not faction_id.isdigit():
+                raise BadRequest("Expected a faction id.")
+            faction = await aget_object_or_404(Faction, pk=faction_id, is_deleted=False)
+            queryset = queryset.in_subtree(faction)
+        return queryset.search_members(self.request.GET.get("q"))
+
+    def get_paginator(self, queryset):
+        if "search_rank" in queryset.query.annotations:
+            return KeysetPaginator("search_rank", per_page=self.page_size, descending=True)
+        return super().get_paginator(queryset)
+
+
+class AsyncAttendeeApiView(AsyncProfileApiView):
+    queryset = AttendeeProfile.objects.select_related("user", "faction")
+    serializer_class = AttendeeSerializer
+
+
+class AsyncLeaderApiView(AsyncProfileApiView):
+    queryset = LeaderProfile.objects.select_related("user", "faction")
+    serializer_class = LeaderSerializer
+
+
+class AsyncFactionApiView(AsyncApiView):
+    queryset = Faction.objects.filter(is_deleted=False)
+    serializer_class = FactionSerializer
+    sort_field = "name"
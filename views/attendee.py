@@ -18,56 +18,60 @@ from core.views.base import (
 from core.api import BaseModelViewSet
 from core.permissions import IsAuthenticatedAndActive
 from core.mixins.views import FactionScopedMixin, PortalPermissionMixin, LoginRequiredMixin
-from core.dashboard_data import (
-    get_attendee_resources,
-    get_attendee_announcements,
-    get_attendee_schedule,
-)
+from core.dashboard_data import get_attendee_schedule
 
 from enrollment.tables.attendee_class import ClassScheduleTable
 from enrollment.tables.attendee import AttendeeEnrollmentTable, AttendeeScheduleTable
 from enrollment.models.attendee import AttendeeEnrollment
 from enrollment.forms.attendee import AttendeeClassAssignmentForm, AttendeeQuartersAssignmentForm
 
+from ..dashboard_data import get_attendee_announcements, get_attendee_resources
 from ..models.attendee import AttendeeProfile
 from faction.models.faction import Faction
+from ..pagination import MemberCursorPagination
 from ..serializers import AttendeeSerializer
 from ..forms.attendee import AttendeeForm, PromoteAttendeeForm, RegistrationForm
 from ..tables.attendee import AttendeeTable
+from .mixins import (
+    ConcurrentWidgetMixin,
+    KeysetTableMixin,
+    MemberSearchViewSetMixin,
+    MemoizedScopeMixin,
+)
 
 
-class IndexView(FactionScopedMixin, BaseTableListView):
+class IndexView(MemoizedScopeMixin, KeysetTableMixin, FactionScopedMixin, BaseTableListView):
     model = AttendeeProfile
     table_class = AttendeeTable
     template_name = "attendee/list.html"
     context_object_name = "attendee"
     paginate_by = 10
     faction_kwarg = "faction_slug"
-
-    def get_scope_faction(self):
+    keyset_sort_fields = {
+        "username": "user__username",
+        "first_name": "user__first_name",
+        "last_name": "user__last_name",
+        "email": "user__email",
+        "faction": "faction__name",
+    }
+
+    def resolve_scope_faction(self):
         slug = self.kwargs.get("faction_slug") or self.kwargs.get("slug")
         if slug:
             return get_object_or_404(Faction, slug=slug)
-        return super().get_scope_faction()
+        return super().resolve_scope_faction()
 
     def get_queryset(self):
         queryset = AttendeeProfile.objects.select_related("user", "faction", "organization")
         faction = self.get_scope_faction()
+        query = self.get_search_query()
         if faction:
-            faction_ids = []
-            stack = [faction]
-            while stack:
-                current = stack.pop()
-                faction_ids.append(current.id)
-                stack.extend(list(current.children.all()))
-            queryset = queryset.filter(faction_id__in=faction_ids)
-        return queryset.order_by("user__username")
+            # Searches reach the whole subtree; the plain list is the faction's own.
+            queryset = queryset.in_subtree(faction) if query else queryset.filter(faction=faction)
+        return queryset.search_members(query).order_by("user__username")
 
-    def get_table_data(self):
-        return list(self.get_queryset())
 
-
-class CreateView(LoginRequiredMixin, FactionScopedMixin, BaseCreateView):
+class CreateView(LoginRequiredMixin, MemoizedScopeMixin, FactionScopedMixin, BaseCreateView):
     model = AttendeeProfile
     form_class = AttendeeForm
     template_name = "attendee/form.html"
@@ -146,9 +150,10 @@ class DeleteView(LoginRequiredMixin, BaseDeleteView):
         )
 
 
-class AttendeeViewSet(BaseModelViewSet):
+class AttendeeViewSet(MemberSearchViewSetMixin, BaseModelViewSet):
     queryset = AttendeeProfile.objects.select_related("user", "faction")
     serializer_class = AttendeeSerializer
+    pagination_class = MemberCursorPagination
     permission_classes = [IsAuthenticatedAndActive]
     permission_classes = []
 
@@ -159,7 +164,7 @@ class ShowView(BaseDetailView):
     context_object_name = "attendee"
 
 
-class ManageView(PortalPermissionMixin, FactionScopedMixin, BaseManageView):
+class ManageView(PortalPermissionMixin, MemoizedScopeMixin, FactionScopedMixin, BaseManageView):
     template_name = "attendee/manage.html"
     portal_key = "faction"
 
@@ -187,7 +192,13 @@ class ManageView(PortalPermissionMixin, FactionScopedMixin, BaseManageView):
         }
 
 
-class DashboardView(PortalPermissionMixin, FactionScopedMixin, BaseDashboardView):
+class DashboardView(
+    PortalPermissionMixin,
+    MemoizedScopeMixin,
+    ConcurrentWidgetMixin,
+    FactionScopedMixin,
+    BaseDashboardView,
+):
     """
     Dashboard for attendees.
     """
@@ -202,12 +213,12 @@ class DashboardView(PortalPermissionMixin, FactionScopedMixin, BaseDashboardView
 
     def get_attendee_announcements_widget(self, _definition):
         faction = self.get_scope_faction()
-        items = get_attendee_announcements(faction)
+        items = get_attendee_announcements(faction, portal=self.portal_key)
         return {"items": items}
 
     def get_attendee_resources_widget(self, _definition):
         faction = self.get_scope_faction()
-        return {"items": get_attendee_resources(faction)}
+        return {"items": get_attendee_resources(faction, portal=self.portal_key)}
 
 
 class RegisterAttendeeView(BaseFormView):
@@ -1,9 +1,17 @@
 # faction/views/faction.py
 
+import hashlib
+
+from django.core.cache import cache
+from django.http import Http404, StreamingHttpResponse
 from django.urls import reverse_lazy, reverse
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib import messages
-from rest_framework import viewsets
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from django.views.generic import TemplateView
 from django_tables2 import MultiTableMixin, SingleTableView
 
@@ -23,56 +31,68 @@ from core.permissions import IsAuthenticatedAndActive
 from core.mixins.models import SoftDeleteMixin, SlugMixin, TrackChangesMixin
 from core.mixins.views import LoginRequiredMixin, PortalPermissionMixin
 from core.views.base_helpers import build_tables_from_config
-from core.utils import get_leader_profile, is_leader_admin
 
 from organization.models.organization import Organization
 from enrollment.models.faction import FactionEnrollment
 from user.models import User
 
+from ..cache import ENROLLMENT_VERSION, SUBTREE_VERSION, get_versions
 from ..models.faction import Faction
 from ..models.leader import LeaderProfile
 from ..models.attendee import AttendeeProfile
 from ..forms.faction import FactionForm, ChildFactionForm
+from ..exporters import iter_subtree_jsonl
+from ..importers import FactionTreeImporter
+from ..permissions import AdministersFaction, LeadsFaction, leads_faction
 from ..tables.faction import FactionTable, ChildFactionTable
 from enrollment.tables.faction import FactionEnrollmentTable
 from ..tables.attendee import AttendeeTable
 from ..tables.leader import LeaderTable
 from ..tables.roster import RosterTable
+from ..querysets.roster import roster_queryset
 from ..serializers import FactionSerializer
+from .mixins import KeysetTableMixin, MemoizedScopeMixin, RosterExportMixin
 
 
-class RosterView(LoginRequiredMixin, PortalPermissionMixin, SingleTableView):
+class RosterView(
+    MemoizedScopeMixin,
+    RosterExportMixin,
+    KeysetTableMixin,
+    LoginRequiredMixin,
+    PortalPermissionMixin,
+    SingleTableView,
+):
     model = LeaderProfile
     table_class = RosterTable
     template_name = "faction/roster.html"
     portal_key = "faction"
-
-    def get_faction(self):
+    paginate_by = 25
+    keyset_sort_fields = {
+        "username": "username",
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "email": "email",
+        "user_type": "user_type",
+        "faction": "faction_name",
+    }
+    # Ids repeat across the two unioned profile tables; the type makes the order total.
+    keyset_id_field = ("member_type", "member_id")
+
+    def resolve_scope_faction(self):
         slug = self.kwargs.get("faction_slug") or self.kwargs.get("slug")
         return get_object_or_404(Faction, slug=slug, is_deleted=False)
 
-    def _faction_and_descendants(self, faction):
-        ids = []
-        stack = [faction]
-        while stack:
-            current = stack.pop()
-            ids.append(current.id)
-            stack.extend(list(current.children.all()))
-        return ids
+    def get_faction(self):
+        return self.get_scope_faction()
 
-    def get_table_data(self):
+    def get_keyset_source(self):
+        # The keyset condition goes into both halves of the UNION ALL
         faction = self.get_faction()
-        faction_ids = self._faction_and_descendants(faction)
-        leaders_qs = LeaderProfile.objects.filter(
-            faction_id__in=faction_ids
-        ).select_related("user", "organization", "faction")
-        attendees_qs = AttendeeProfile.objects.filter(
-            faction_id__in=faction_ids
-        ).select_related("user", "organization", "faction")
-        return list(leaders_qs) + list(attendees_qs)
+        query = self.get_search_query()
+        return lambda condition: roster_queryset(faction, condition, query)
 
     def get_queryset(self):
-        return self.get_table_data()
+        return roster_queryset(self.get_faction())
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -92,15 +112,27 @@ class CreateView(SlugMixin, BaseCreateView):
     template_name = "faction/form.html"
     success_message = "Faction created successfully!"
 
+    def get_organization(self):
+        return get_object_or_404(Organization, pk=self.request.user.organization_id)
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs["organization"] = self.get_organization()
+        return kwargs
+
     def form_valid(self, form):
         # Ensure slug exists
         if not form.instance.slug:
             form.instance.slug = self.generate_slug("name")
 
         # Attach to the user's organization
-        form.instance.organization = get_object_or_404(
-            Organization, pk=self.request.user.organization_id
-        )
+        form.instance.organization = self.get_organization()
+        # A new faction is placed like a moved one: same organization, within the depth limit
+        try:
+            form.instance.validate_move(form.cleaned_data.get("parent"))
+        except ValidationError as exc:
+            form.add_error("parent", exc)
+            return self.form_invalid(form)
         return super().form_valid(form)
 
     def get_success_url(self):
@@ -116,6 +148,17 @@ class UpdateView(TrackChangesMixin, BaseUpdateView):
     slug_field = "slug"
     slug_url_kwarg = "faction_slug"
 
+    def form_valid(self, form):
+        if "parent" in form.changed_data:
+            try:
+                form.instance.validate_move(form.cleaned_data.get("parent"))
+            except ValidationError as exc:
+                form.add_error("parent", exc)
+                return self.form_invalid(form)
+        # The single form save rewrites the subtree when the parent changed
+        with transaction.atomic():
+            return super().form_valid(form)
+
 
 class DeleteView(SoftDeleteMixin, BaseDeleteView):
     model = Faction
@@ -139,44 +182,49 @@ class IndexByOrganizationView(BaseIndexByFilterTableView):
 
     def get_queryset(self):
         # Apply Base logic + filter out soft-deleted
-        return super().get_queryset().filter(is_deleted=False)
+        return (
+            super().get_queryset()
+            .filter(is_deleted=False)
+            .with_ancestors()
+            .with_subtree_member_counts()
+        )
 
 
-class ManageView(LoginRequiredMixin, PortalPermissionMixin, BaseManageView):
+class ManageView(
+    MemoizedScopeMixin, RosterExportMixin, LoginRequiredMixin, PortalPermissionMixin, BaseManageView
+):
     template_name = "faction/manage.html"
+    # Rendered tables are keyed by data versions; the timeout only bounds
+    # staleness from changes no signal reports (e.g. queryset.update()).
+    table_cache_timeout = 60 * 15
 
     def test_func(self):
-        return is_leader_admin(self.request.user)
+        return self.is_leader_admin()
 
-    def get_scope_object(self):
+    def resolve_scope_object(self):
         """Return the faction associated with the leader."""
         slug = self.kwargs.get("faction_slug")
         if slug:
             return get_object_or_404(Faction, slug=slug, is_deleted=False)
-        profile = get_leader_profile(self.request.user)
+        profile = self.get_leader_profile()
         faction_id = getattr(profile, "faction_id", None)
         return get_object_or_404(Faction, id=faction_id, is_deleted=False)
 
+    def resolve_scope_faction(self):
+        return self.get_scope_object()
+
     def get_tables_config(self):
         faction = self.get_scope_object()
 
         leaders_qs = LeaderProfile.objects.filter(faction=faction).select_related("user")
 
-        attendee_ids = []
-        stack = [faction]
-        while stack:
-            current = stack.pop()
-            attendee_ids.append(current.id)
-            stack.extend(list(current.children.all()))
-        attendees_qs = AttendeeProfile.objects.filter(
-            faction_id__in=attendee_ids
-        ).select_related("user")
+        attendees_qs = AttendeeProfile.objects.in_subtree(faction).select_related("user")
 
         child_factions_qs = Faction.objects.filter(
             parent=faction, is_deleted=False
-        )
+        ).select_related("organization", "parent").with_subtree_member_counts()
 
-        return {
+        config = {
             "leaders": {
                 "class": LeaderTable,
                 "queryset": leaders_qs,
@@ -198,34 +246,113 @@ class ManageView(LoginRequiredMixin, PortalPermissionMixin, BaseManageView):
                 "context": {"faction_slug": faction.slug},
             },
         }
+        panel = self.kwargs.get("panel")
+        if panel:
+            if panel not in config:
+                raise Http404(f"Unknown manage panel '{panel}'.")
+            config = {panel: config[panel]}
+        # Tables already served from the fragment cache are not built again.
+        cached = getattr(self, "_table_fragments", {})
+        return {name: entry for name, entry in config.items() if name not in cached}
+
+    def get_table_cache_keys(self, faction, names):
+        """
+        Return ``{table name: cache key}`` for the rendered tables.
+
+        Keys combine the faction, the viewer, the query string (page/sort
+        params) and the faction's subtree and enrollment versions. Profile,
+        faction and enrollment saves and deletes bump them, as do edits to
+        the user fields the member tables show.
+        """
+        subtree_version, enrollment_version = get_versions(
+            (SUBTREE_VERSION, faction.pk), (ENROLLMENT_VERSION, faction.pk)
+        )
+        params = sorted(
+            (key, values) for key, values in self.request.GET.lists() if key != self.export_kwarg
+        )
+        digest = hashlib.md5(repr(params).encode()).hexdigest()
+        prefix = (
+            f"faction:manage:{faction.pk}:{self.request.user.pk}:"
+            f"{subtree_version}.{enrollment_version}:{digest}"
+        )
+        return {name: f"{prefix}:{name}" for name in names}
+
+    def render_table_fragment(self, table):
+        model_meta = getattr(table, "Meta", None)
+        model = getattr(model_meta, "model", None) if model_meta else None
+        verbose_name = model._meta.verbose_name.title() if model else ""
+        verbose_name_plural = model._meta.verbose_name_plural.title() if model else ""
+        create_url = getattr(table, "add_url", None)
+        return {
+            "html": table.as_html(self.request),
+            "name": verbose_name or table.__class__.__name__,
+            "name_plural": verbose_name_plural or verbose_name or table.__class__.__name__,
+            "create_url": str(create_url) if create_url else None,
+            "icon": getattr(table, "add_icon", None),
+        }
+
+    def get_table_fragments(self, faction):
+        """
+        Return the rendered tables of ``get_tables_config()``, cached ones first read.
+        """
+        names = list(self.get_tables_config())
+        keys = self.get_table_cache_keys(faction, names)
+        hits = cache.get_many(keys.values())
+        self._table_fragments = {name: hits[key] for name, key in keys.items() if key in hits}
+
+        if len(self._table_fragments) < len(names):
+            rendered = {
+                name: self.render_table_fragment(table)
+                for name, table in self.build_tables().items()
+            }
+            cache.set_many(
+                {keys[name]: fragment for name, fragment in rendered.items()},
+                self.table_cache_timeout,
+            )
+            self._table_fragments.update(rendered)
+        return [self._table_fragments[name] for name in names if name in self._table_fragments]
 
     def get_context_data(self, **kwargs):
-        # Bypass MultiTableMixin's get_context_data, which expects self.tables, and
-        # instead leverage the BaseManageView helpers to build tables from config.
+        # Only the page shell renders here; each table is fetched from its
+        # ManagePanelView endpoint, so no table is queried before the first byte.
         context = TemplateView.get_context_data(self, **kwargs)
 
-        tables = self.build_tables()
-        formatted = []
-        for table in tables.values():
-            model_meta = getattr(table, "Meta", None)
-            model = getattr(model_meta, "model", None) if model_meta else None
-            verbose_name = model._meta.verbose_name.title() if model else ""
-            verbose_name_plural = model._meta.verbose_name_plural.title() if model else ""
-            formatted.append(
-                {
-                    "table": table,
-                    "name": verbose_name or table.__class__.__name__,
-                    "name_plural": verbose_name_plural or verbose_name or table.__class__.__name__,
-                    "create_url": getattr(table, "add_url", None),
-                    "icon": getattr(table, "add_icon", None),
-                }
-            )
+        faction = self.get_scope_object()
+        panels = [
+            {
+                "name": name,
+                "url": reverse(
+                    "factions:manage_panel", kwargs={"faction_slug": faction.slug, "panel": name}
+                ),
+            }
+            for name in self.get_tables_config()
+        ]
+        context.update(
+            scope_object=faction,
+            faction=faction,
+            panels=panels,
+            edit_url=reverse_lazy("factions:update", kwargs={"faction_slug": faction.slug}),
+        )
+        return context
 
+
+class ManagePanelView(ManageView):
+    """
+    One ``ManageView`` table as a bare HTML fragment.
+
+    Each panel pages and sorts on its own query string, and its rendered HTML
+    goes through the same versioned fragment cache as before.
+    """
+
+    template_name = "faction/manage_panel.html"
+
+    def get_context_data(self, **kwargs):
+        context = TemplateView.get_context_data(self, **kwargs)
+        faction = self.get_scope_object()
         context.update(
-            scope_object=self.get_scope_object(),
-            faction=self.get_scope_object(),
-            tables_with_names=formatted,
-            edit_url=reverse_lazy("factions:update", kwargs={"faction_slug": self.get_scope_object().slug}),
+            faction=faction,
+            panel=self.kwargs["panel"],
+            item=self.get_table_fragments(faction)[0],
         )
         return context
 
@@ -242,7 +369,7 @@ class ShowView(BaseSlugOrPkObjectMixin, BaseDetailView):
             or self.kwargs.get("faction_slug")
             or self.kwargs.get("slug")
         )
-        return get_object_or_404(Faction, slug=slug, is_deleted=False)
+        return get_object_or_404(Faction.objects.with_ancestors(), slug=slug, is_deleted=False)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -250,6 +377,7 @@ class ShowView(BaseSlugOrPkObjectMixin, BaseDetailView):
         if faction:
             context["child_factions"] = faction.children.filter(is_deleted=False)
             context["parent_faction"] = faction.parent
+            context["ancestors"] = faction.get_ancestors()
         return context
 
 
@@ -292,3 +420,97 @@ class FactionViewSet(viewsets.ModelViewSet):
     queryset = Faction.objects.filter(is_deleted=False)
     serializer_class = FactionSerializer
     permission_classes = [IsAuthenticatedAndActive]
+
+    def perform_update(self, serializer):
+        faction = serializer.instance
+        new_parent = serializer.validated_data.get("parent", faction.parent)
+        if new_parent != faction.parent:
+            self._check_move(faction, new_parent)
+        # One save; Faction.save() rewrites the subtree when the parent changed.
+        with transaction.atomic():
+            serializer.save()
+
+    @action(detail=True, methods=["post"])
+    def move(self, request, pk=None):
+        """Move the faction and its subtree under ``parent`` (or to the top level)."""
+        faction = self.get_object()
+        parent_id = request.data.get("parent")
+        new_parent = (
+            get_object_or_404(
+                Faction, pk=parent_id, organization_id=faction.organization_id, is_deleted=False
+            )
+            if parent_id
+            else None
+        )
+        self._check_move(faction, new_parent)
+        with transaction.atomic():
+            faction.parent = new_parent
+            faction.save()
+        return Response(self.get_serializer(faction).data)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        permission_classes=[IsAuthenticatedAndActive, AdministersFaction],
+    )
+    def import_tree(self, request):
+        """
+        Import a faction tree: JSON ``factions`` (nested) or an uploaded CSV ``file``.
+
+        Importing under ``parent`` takes a leader admin of that faction;
+        importing top-level factions takes one of the organization.
+        """
+        organization = get_object_or_404(
+            Organization, pk=request.data.get("organization") or request.user.organization_id
+        )
+        parent_id = request.data.get("parent")
+        parent = (
+            get_object_or_404(Faction, pk=parent_id, organization=organization, is_deleted=False)
+            if parent_id
+            else None
+        )
+        self.check_object_permissions(request, parent or organization)
+        try:
+            importer = FactionTreeImporter(organization, parent=parent)
+            if "file" in request.FILES:
+                created = importer.import_csv(request.FILES["file"].read())
+            else:
+                created = importer.import_json(request.data.get("factions") or [])
+        except ValidationError as exc:
+            raise serializers.ValidationError({"factions": exc.messages})
+        return Response({"created": len(created)}, status=status.HTTP_201_CREATED)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        permission_classes=[IsAuthenticatedAndActive, LeadsFaction],
+    )
+    def export(self, request, pk=None):
+        """
+        Stream the faction subtree with its leaders and attendees as JSON Lines.
+
+        Only leaders of the faction or one of its ancestors may export it.
+        """
+        faction = self.get_object()
+        response = StreamingHttpResponse(
+            iter_subtree_jsonl(faction), content_type="application/x-ndjson"
+        )
+        response["Content-Disposition"] = f'attachment; filename="{faction.slug}.jsonl"'
+        return response
+
+    def _check_move(self, faction, new_parent):
+        """
+        Require a leader admin of both the moved faction and its new place, then validate.
+
+        The new place is ``new_parent``, or the organization for a move to the top level.
+        """
+        for target in (faction, new_parent or faction.organization):
+            if not leads_faction(self.request.user, target, admin=True):
+                self.permission_denied(
+                    self.request, message="Moving a faction takes a leader admin of both ends."
+                )
+        try:
+            faction.validate_move(new_parent)
+        except ValidationError as exc:
+            raise serializers.ValidationError({"parent": exc.messages})
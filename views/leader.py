@@ -17,27 +17,33 @@ from core.views.base import (
 from core.mixins.views import FactionScopedMixin, PortalPermissionMixin, LoginRequiredMixin
 from core.api import BaseModelViewSet
 from core.permissions import IsAuthenticatedAndActive
-from core.dashboard_data import (
-    get_faction_enrollment_counts,
-    get_leader_metrics,
-    get_leader_resource_links,
-)
-from core.utils import is_leader_admin, get_leader_profile
 
 from enrollment.tables.leader import LeaderEnrollmentTable
 from enrollment.models.leader import LeaderEnrollment
 
+from faction.dashboard_data import (
+    get_faction_enrollment_counts,
+    get_leader_metrics,
+    get_leader_resource_links,
+)
 from faction.models.faction import Faction
 from faction.models.leader import LeaderProfile
+from faction.pagination import MemberCursorPagination
 from faction.serializers import LeaderSerializer
 from faction.forms.leader import LeaderForm, PromoteLeaderForm, RegistrationForm, QuartersAssignmentForm
 from faction.tables.faction import FactionOverviewTable
 from faction.tables.leader import LeaderTable
+from faction.views.mixins import (
+    ConcurrentWidgetMixin,
+    KeysetTableMixin,
+    MemberSearchViewSetMixin,
+    MemoizedScopeMixin,
+)
 
 User = get_user_model()
 
 
-class ManageView(PortalPermissionMixin, FactionScopedMixin, BaseManageView):
+class ManageView(PortalPermissionMixin, MemoizedScopeMixin, FactionScopedMixin, BaseManageView):
     template_name = "leader/manage.html"
     portal_key = "faction"
 
@@ -64,36 +70,45 @@ class ManageView(PortalPermissionMixin, FactionScopedMixin, BaseManageView):
         }
 
 
-class IndexView(FactionScopedMixin, BaseTableListView):
+class IndexView(MemoizedScopeMixin, KeysetTableMixin, FactionScopedMixin, BaseTableListView):
     model = LeaderProfile
     table_class = LeaderTable
     template_name = "leader/list.html"
     context_object_name = "leader"
     paginate_by = 10
     faction_kwarg = "faction_slug"
+    keyset_sort_fields = {
+        "username": "user__username",
+        "first_name": "user__first_name",
+        "last_name": "user__last_name",
+        "email": "user__email",
+        "faction": "faction__name",
+    }
 
     def get_queryset(self):
         queryset = LeaderProfile.objects.select_related("user", "faction", "organization")
         faction = self.get_scope_faction()
+        query = self.get_search_query()
         if faction:
-            queryset = queryset.filter(faction=faction)
-        return queryset
+            # Searches reach the whole subtree; the plain list is the faction's own.
+            queryset = queryset.in_subtree(faction) if query else queryset.filter(faction=faction)
+        return queryset.search_members(query)
 
 
-class CreateView(LoginRequiredMixin, FactionScopedMixin, BaseCreateView):
+class CreateView(LoginRequiredMixin, MemoizedScopeMixin, FactionScopedMixin, BaseCreateView):
     model = LeaderProfile
     form_class = LeaderForm
     template_name = "leader/form.html"
     action = "Create"
 
-    def get_scope_faction(self):
+    def resolve_scope_faction(self):
         slug = self.kwargs.get("faction_slug") or self.kwargs.get("slug")
         if slug:
             try:
                 return Faction.objects.get(slug=slug)
             except Faction.DoesNotExist:
                 return None
-        profile = get_leader_profile(self.request.user)
+        profile = self.get_leader_profile()
         return getattr(profile, "faction", None)
 
     def get_initial(self):
@@ -119,7 +134,7 @@ class CreateView(LoginRequiredMixin, FactionScopedMixin, BaseCreateView):
         )
 
 
-class UpdateView(LoginRequiredMixin, FactionScopedMixin, BaseUpdateView):
+class UpdateView(LoginRequiredMixin, MemoizedScopeMixin, FactionScopedMixin, BaseUpdateView):
     model = LeaderProfile
     form_class = LeaderForm
     template_name = "leader/form.html"
@@ -157,9 +172,10 @@ class DeleteView(LoginRequiredMixin, BaseDeleteView):
         )
 
 
-class LeaderViewSet(BaseModelViewSet):
+class LeaderViewSet(MemberSearchViewSetMixin, BaseModelViewSet):
     queryset = LeaderProfile.objects.select_related("user", "faction")
     serializer_class = LeaderSerializer
+    pagination_class = MemberCursorPagination
     permission_classes = [IsAuthenticatedAndActive]
 
 
@@ -169,7 +185,13 @@ class ShowView(BaseDetailView):
     context_object_name = "leader"
 
 
-class DashboardView(PortalPermissionMixin, FactionScopedMixin, BaseDashboardView):
+class DashboardView(
+    PortalPermissionMixin,
+    MemoizedScopeMixin,
+    ConcurrentWidgetMixin,
+    FactionScopedMixin,
+    BaseDashboardView,
+):
     """
     Dashboard for leaders.
     """
@@ -182,7 +204,7 @@ class DashboardView(PortalPermissionMixin, FactionScopedMixin, BaseDashboardView
         faction = self.get_scope_faction()
         if not faction:
             return Faction.objects.none()
-        return Faction.objects.filter(pk=faction.pk)
+        return Faction.objects.filter(pk=faction.pk).with_subtree_member_counts()
 
     def get_quick_actions(self):
         """Return quick actions for the leader."""
@@ -190,15 +212,12 @@ class DashboardView(PortalPermissionMixin, FactionScopedMixin, BaseDashboardView
             {"label": "Add Attendee", "url": reverse("attendees:new")},
         ]
 
-    def is_leader_admin(self):
-        return is_leader_admin(self.request.user)
-
     def is_leader_standard(self):
-        return not is_leader_admin(self.request.user)
+        return not self.is_leader_admin()
 
     def get_leader_metrics_widget(self, _definition):
         faction = self.get_scope_faction()
-        metrics = get_leader_metrics(faction)
+        metrics = get_leader_metrics(faction, portal=self.portal_key)
         if not metrics:
             return None
         return {"metrics": metrics}
@@ -209,7 +228,7 @@ class DashboardView(PortalPermissionMixin, FactionScopedMixin, BaseDashboardView
 
     def get_leader_chart_widget(self, _definition):
         faction = self.get_scope_faction()
-        data = get_faction_enrollment_counts(faction)
+        data = get_faction_enrollment_counts(faction, portal=self.portal_key)
         if not data:
             return None
         labels = [item["label"] for item in data]
@@ -240,7 +259,7 @@ class DashboardView(PortalPermissionMixin, FactionScopedMixin, BaseDashboardView
 
     def get_leader_resources_widget(self, _definition):
         faction = self.get_scope_faction()
-        resources = get_leader_resource_links(faction)
+        resources = get_leader_resource_links(faction, portal=self.portal_key)
         return {"items": resources}
 
 
@@ -0,0 +1,330 @@
+# faction/views/mixins.py
+
+import logging
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework.exceptions import ValidationError
+
+from core.utils import get_leader_profile, is_leader_admin
+
+from .. import exporters
+from ..models.faction import Faction
+from ..pagination import KeysetPaginator
+
+logger = logging.getLogger(__name__)
+
+_WIDGET_BUILDER = re.compile(r"get_\w+_widget")
+
+
+class MemoizedScopeMixin:
+    """
+    Resolve the request's scope once per view instance, i.e. once per request.
+
+    Place it before ``FactionScopedMixin``/``BaseManageView``; views that look
+    the scope up themselves override ``resolve_scope_faction()`` or
+    ``resolve_scope_object()`` instead of the ``get_*`` methods.
+    """
+
+    def _memoize(self, name, resolve):
+        memo = self.__dict__.setdefault("_scope_memo", {})
+        if name not in memo:
+            memo[name] = resolve()
+        return memo[name]
+
+    def get_scope_faction(self):
+        return self._memoize("faction", self.resolve_scope_faction)
+
+    def resolve_scope_faction(self):
+        return super().get_scope_faction()
+
+    def get_scope_object(self):
+        return self._memoize("object", self.resolve_scope_object)
+
+    def resolve_scope_object(self):
+        return super().get_scope_object()
+
+    def get_leader_profile(self):
+        return self._memoize("leader_profile", lambda: get_leader_profile(self.request.user))
+
+    def is_leader_admin(self):
+        return self._memoize("is_leader_admin", lambda: is_leader_admin(self.request.user))
+
+
+class KeysetTableMixin:
+    """
+    Render a django-tables2 list one keyset page at a time.
+
+    ``keyset_sort_fields`` maps the table's sortable columns to database
+    fields; ``?sort=`` picks one (``-`` for descending) and ``?cursor=`` carries
+    the position, so deep pages cost the same as the first one. With a ``?q=``
+    search and no explicit sort, rows come best match first.
+    """
+
+    cursor_kwarg = "cursor"
+    search_kwarg = "q"
+    keyset_sort_fields = {"username": "user__username"}
+    keyset_default_sort = "username"
+    keyset_id_field = "pk"
+
+    def get_paginate_by(self, queryset):
+        # The list view must not COUNT/OFFSET the queryset; the keyset page replaces it.
+        return None
+
+    def get_keyset_source(self):
+        """Return the queryset (or keyset-condition callable) to paginate."""
+        return self.get_queryset()
+
+    def get_search_query(self):
+        return self.request.GET.get(self.search_kwarg, "").strip()
+
+    def get_keyset_sort(self):
+        sort = self.request.GET.get("sort", "")
+        name = sort.lstrip("-")
+        if not name and self.get_search_query():
+            return "search_rank", True
+        if name not in self.keyset_sort_fields:
+            return self.keyset_sort_fields[self.keyset_default_sort], False
+        return self.keyset_sort_fields[name], sort.startswith("-")
+
+    def get_keyset_paginator(self):
+        sort_field, descending = self.get_keyset_sort()
+        return KeysetPaginator(
+            sort_field,
+            self.keyset_id_field,
+            per_page=self.paginate_by or 25,
+            descending=descending,
+        )
+
+    def get_keyset_page(self):
+        if not hasattr(self, "_keyset_page"):
+            self._keyset_page = self.get_keyset_paginator().page(
+                self.get_keyset_source(), self.request.GET.get(self.cursor_kwarg)
+            )
+        return self._keyset_page
+
+    def get_table_data(self):
+        return self.get_keyset_page().rows
+
+    def get_table_kwargs(self):
+        # The page already comes in keyset order (best match first for a
+        # search); the table must not sort it again by its Meta.order_by.
+        return {**super().get_table_kwargs(), "order_by": ()}
+
+    def get_table_pagination(self, table):
+        return False
+
+    def get_cursor_url(self, cursor):
+        if cursor is None:
+            return None
+        params = self.request.GET.copy()
+        params[self.cursor_kwarg] = cursor
+        return f"?{params.urlencode()}"
+
+    def get_keyset_context(self, page):
+        return {
+            "keyset_page": page,
+            "search_query": self.get_search_query(),
+            "next_page_url": self.get_cursor_url(page.next_cursor),
+            "previous_page_url": self.get_cursor_url(page.previous_cursor),
+        }
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(self.get_keyset_context(self.get_keyset_page()))
+        return context
+
+
+class RosterExportMixin:
+    """
+    Serve the subtree roster as a download when ``?export=csv`` or ``?export=xlsx``.
+
+    CSV is streamed line by line. XLSX is written in openpyxl's write-only
+    mode to a temporary file, which is then served as a file response, so
+    neither format holds the roster in memory.
+    """
+
+    export_kwarg = "export"
+    export_chunk_size = 2000
+
+    def get_export_faction(self):
+        return self.get_scope_faction()
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get(self.export_kwarg)
+        if export_format:
+            return self.export_roster(export_format)
+        return super().get(request, *args, **kwargs)
+
+    def export_roster(self, export_format):
+        faction = self.get_export_faction()
+        filename = f"{faction.slug}-roster.{export_format}"
+        if export_format == "csv":
+            response = StreamingHttpResponse(
+                exporters.iter_roster_csv(faction, chunk_size=self.export_chunk_size),
+                content_type="text/csv",
+            )
+            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+            return response
+        if export_format == "xlsx" and exporters.Workbook is not None:
+            stream = tempfile.TemporaryFile()
+            exporters.write_roster_xlsx(faction, stream, chunk_size=self.export_chunk_size)
+            stream.seek(0)
+            return FileResponse(
+                stream,
+                as_attachment=True,
+                filename=filename,
+                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+        raise Http404(f"Roster export format '{export_format}' is not available.")
+
+
+class MemberSearchViewSetMixin:
+    """
+    ``?faction=<id>`` subtree scoping and ``?q=`` ranked search for profile viewsets.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        faction_id = params.get("faction")
+        if faction_id:
+            if not faction_id.isdigit():
+                raise ValidationError({"faction": "Expected a faction id."})
+            faction = get_object_or_404(Faction, pk=faction_id, is_deleted=False)
+            queryset = queryset.in_subtree(faction)
+        return queryset.search_members(params.get("q"))
+
+
+def _precomputed_widget(value, _definition=None):
+    return value
+
+
+class _WidgetRun:
+    """A builder submitted to the widget pool, with the time a worker picked it up."""
+
+    def __init__(self, builder):
+        self.builder = builder
+        self.started = threading.Event()
+        self.started_at = None
+
+    def __call__(self):
+        self.started_at = time.monotonic()
+        self.started.set()
+        try:
+            return self.builder(None)
+        finally:
+            # Pool threads keep their connections between builders, like a
+            # request thread; drop only the expired or broken ones.
+            close_old_connections()
+
+
+_widget_executor = None
+_widget_executor_lock = threading.Lock()
+
+
+def get_widget_executor():
+    """
+    Return the process-wide widget pool, created on first use.
+
+    Every request shares it, so ``FACTION_WIDGET_MAX_WORKERS`` (default 4)
+    bounds the widget threads, and the database connections they hold, for
+    the whole process rather than per request.
+    """
+    global _widget_executor
+    if _widget_executor is None:
+        with _widget_executor_lock:
+            if _widget_executor is None:
+                _widget_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "FACTION_WIDGET_MAX_WORKERS", 4),
+                    thread_name_prefix="faction-widget",
+                )
+    return _widget_executor
+
+
+class ConcurrentWidgetMixin:
+    """
+    Opt-in concurrent evaluation of a dashboard's ``get_*_widget`` builders.
+
+    When enabled (``concurrent_widgets = True`` or the
+    ``FACTION_CONCURRENT_WIDGETS`` setting), every builder runs on the shared,
+    bounded widget pool before the dashboard is assembled, so latency follows
+    the slowest widget rather than the sum. Each builder's timeout
+    (``widget_timeouts[name]`` or ``widget_timeout`` seconds) counts from the
+    moment a worker starts it; a builder that runs past it is rendered as
+    absent, exactly like a builder returning ``None``. A builder no worker has
+    picked up within that time (the pool is saturated by other requests) is
+    withdrawn and run on the request thread instead. Builders must not rely
+    on their ``definition`` argument, which is ``None`` in this mode.
+    """
+
+    concurrent_widgets = None
+    widget_timeout = 5.0
+    widget_timeouts = {}
+
+    def use_concurrent_widgets(self):
+        if self.concurrent_widgets is None:
+            return getattr(settings, "FACTION_CONCURRENT_WIDGETS", False)
+        return self.concurrent_widgets
+
+    def get_widget_builders(self):
+        return {
+            name: getattr(self, name)
+            for name in dir(type(self))
+            if _WIDGET_BUILDER.fullmatch(name) and callable(getattr(type(self), name))
+        }
+
+    def prepare_widget_scope(self):
+        """Resolve shared per-request state on the request thread before fanning out."""
+        getattr(self.request.user, "pk", None)
+        if hasattr(self, "get_scope_faction"):
+            self.get_scope_faction()
+        if hasattr(self, "get_leader_profile"):
+            self.get_leader_profile()
+
+    def evaluate_widgets(self):
+        """
+        Run every widget builder concurrently and return ``{builder name: result}``.
+        """
+        builders = self.get_widget_builders()
+        if not builders:
+            return {}
+        self.prepare_widget_scope()
+
+        results = {}
+        executor = get_widget_executor()
+        submitted = time.monotonic()
+        runs = {name: _WidgetRun(builder) for name, builder in builders.items()}
+        futures = {name: executor.submit(run) for name, run in runs.items()}
+        for name, future in futures.items():
+            run = runs[name]
+            timeout = self.widget_timeouts.get(name, self.widget_timeout)
+            run.started.wait(max(0, submitted + timeout - time.monotonic()))
+            if future.cancel():
+                # Still queued behind other requests' builders: run it here.
+                results[name] = run.builder(None)
+                continue
+            run.started.wait()
+            try:
+                results[name] = future.result(
+                    timeout=max(0, run.started_at + timeout - time.monotonic())
+                )
+            except FutureTimeoutError:
+                logger.warning("Dashboard widget %s timed out after %ss", name, timeout)
+                results[name] = None
+        return results
+
+    def get_context_data(self, **kwargs):
+        if self.use_concurrent_widgets():
+            # Shadow each builder with its result so the dashboard assembles as usual.
+            for name, value in self.evaluate_widgets().items():
+                setattr(self, name, partial(_precomputed_widget, value))
+        return super().get_context_data(**kwargs)